@@ -4,13 +4,23 @@ const selectedTags = new Set();
 const filterTagsContainer = document.getElementById('filterTagsContainer');
 const itemsPerPageContainer = document.getElementById('itemsPerPage');
 const cardsContainer = document.querySelector('.cardContainer');
-const cards = Array.from(document.querySelectorAll('.card')); // Convert NodeList to Array for easy manipulation
-let maxCards = cards.length;
 const currentPageSpan = document.getElementById('currentPage');
 
+// The games come from the data file written by GameList.create_index (window.GAME_INDEX).
+// Only the cards of the shown page are in the DOM.
+const data = window.GAME_INDEX || {fields: [], games: [], domains: [], tags: {}, orders: {}};
+const games = data.games.map(row => {
+    const game = {};
+    data.fields.forEach((field, index) => game[field] = row[index]);
+    game.lowerTitle = game.title.toLowerCase();
+    return game;
+});
+let filteredGames = []; // ids of the games passing the filters, in sort order
+let maxCards = 0;
+
 // Event Listeners
 document.getElementById('itemsPerPage').addEventListener('change', function() {
-    itemsPerPage = this.value;
+    itemsPerPage = Number(this.value);
     currentPage = 1; // Reset to the first page
     updateDisplay(false); //dont sort
 });
@@ -45,21 +55,29 @@ document.getElementById('filterInput').addEventListener('input', updateDisplay);
 document.getElementById('statusFilter').addEventListener('change', updateDisplay);
 document.getElementById('sortOrder').addEventListener('change', updateDisplay);
 document.getElementById('resetButton').addEventListener('click', resetFilters);
-document.querySelectorAll('.tag').forEach(tag => {
-    tag.addEventListener('click', function() {
-        const tagText = this.textContent;
-        if (selectedTags.has(tagText)) {
-            selectedTags.delete(tagText);
-            this.classList.remove('selected');
-        } else {
-            selectedTags.add(tagText);
-            this.classList.add('selected');
-        }
-        updateFilterTagsContainer(); // Update the filter tags container
-        updateDisplay(); // Then update the card display
-    });
+// Cards come and go, so tag clicks are handled by the container
+cardsContainer.addEventListener('click', function(event) {
+    const tag = event.target.closest('.tag');
+    if (tag) {
+        toggleTag(tag.textContent);
+        return;
+    }
+    const image = event.target.closest('.card-image');
+    if (image) {
+        const game = games[Number(image.closest('.card').dataset.id)];
+        openLightbox(encodeURI(game.title), game.images, game.thumbnails);
+    }
 });
 
+function toggleTag(tagText) {
+    if (selectedTags.has(tagText)) {
+        selectedTags.delete(tagText);
+    } else {
+        selectedTags.add(tagText);
+    }
+    updateFilterTagsContainer(); // Update the filter tags container and the card display
+}
+
 function updateFilterTagsContainer() {
     filterTagsContainer.innerHTML = '';
     selectedTags.forEach(tag => {
@@ -68,30 +86,35 @@ function updateFilterTagsContainer() {
         tagEl.classList.add('tag', 'selected'); // 'selected' class for styling
         tagEl.addEventListener('click', function() {
             selectedTags.delete(tag);
-            this.classList.remove('selected');
             updateFilterTagsContainer(); // Update the filter tags container
-            updateDisplay(); // Then update the card display
         });
         filterTagsContainer.appendChild(tagEl);
     });
     updateDisplay();
 }
 
-// Update display based on filters, sort order, and pagination
-function updateDisplay(doSort=true) {
-    if(!!doSort){
-        cards.sort( (a,b) => applySort(a,b) );
+let randomOrder = null;
+
+// The ids of all games in the selected sort order; the orders are precomputed by create_index
+function sortedIds(doSort) {
+    const sortOrder = document.getElementById('sortOrder').value;
+    if (sortOrder === 'random') {
+        if (!randomOrder || doSort) {
+            randomOrder = games.map((_, id) => id);
+            for (let i = randomOrder.length - 1; i > 0; i--) {
+                const j = Math.floor(Math.random() * (i + 1));
+                [randomOrder[i], randomOrder[j]] = [randomOrder[j], randomOrder[i]];
+            }
+        }
+        return randomOrder;
     }
-    cardsContainer.innerHTML = '';
-    cards.forEach(card => cardsContainer.appendChild(card));
+    return data.orders[sortOrder] || games.map((_, id) => id);
+}
 
-    //Hide all cards
-    cards.forEach(card => {
-        card.style.display = 'none'; 
-    });
+// Update display based on filters, sort order, and pagination
+function updateDisplay(doSort=true) {
+    filteredGames = applyAllFilters(sortedIds(!!doSort));
 
-    let filteredGames = cards.filter(card => applyAllFilters(card));
-    
     maxCards = filteredGames.length;
     if(currentPage > Math.ceil(maxCards / itemsPerPage)){
         currentPage = 1; // or Math.ceil(maxCards / itemsPerPage) ? Not sure...
@@ -102,68 +125,115 @@ function updateDisplay(doSort=true) {
 }
 
 // Apply all filters
-function applyAllFilters(card) {
-    return applyTagFilter(card) && 
-            applyTextFilter(card) && 
-            applyStatusFilter(card) &&
-            applyDomainFilter(card);
+function applyAllFilters(ids) {
+    const tagMatches = applyTagFilter();
+    const filterText = document.getElementById('filterInput').value.toLowerCase();
+    const statusFilter = document.getElementById('statusFilter').value;
+    const domainFilter = document.getElementById('domainFilter').value;
+    const domain = domainFilter === 'all' ? -1 : data.domains.indexOf(domainFilter);
+    return ids.filter(id => {
+        const game = games[id];
+        return (tagMatches === null || tagMatches.has(id)) &&
+            applyTextFilter(game, filterText) &&
+            applyStatusFilter(game, statusFilter) &&
+            (domain === -1 || game.domain === domain);
+    });
 }
 
-// Pagination and Display
-function paginateAndDisplay(games) {
+// Pagination and Display: only the cards of the current page are built
+function paginateAndDisplay(ids) {
     const startIndex = (currentPage - 1) * itemsPerPage;
     const endIndex = startIndex + itemsPerPage;
-    games.forEach((card, index) => {
-        card.style.display = (index >= startIndex && index < endIndex) ? '' : 'none';
+    const fragment = document.createDocumentFragment();
+    ids.slice(startIndex, endIndex).forEach(id => fragment.appendChild(createCard(id)));
+    cardsContainer.replaceChildren(fragment);
+}
+
+function createElement(tag, className, text) {
+    const element = document.createElement(tag);
+    if (className) element.className = className;
+    if (text !== undefined) element.textContent = text;
+    return element;
+}
+
+function createCard(id) {
+    const game = games[id];
+    const card = createElement('div', ['card', game.watch ? 'watch' : '', game.status].filter(Boolean).join(' '));
+    card.dataset.id = id;
+    card.dataset.updated = game.updated;
+    card.dataset.published = game.published;
+    if (game.status === 'completed') {
+        card.appendChild(createElement('div', 'completedBadge', 'Completed'));
+    }
+    if (game.status === 'abandoned') {
+        card.appendChild(createElement('div', 'abandonedBadge', 'Abandoned'));
+    }
+
+    const image = createElement('div', 'card-image');
+    if (game.sprite) {
+        // The cover is a cell of a sheet shared with the other cards of the page: one download and decode per page
+        const [sheet, offset] = game.sprite;
+        image.classList.add('sprite');
+        image.style.backgroundImage = `url("${data.sheets[sheet]}")`;
+        image.style.backgroundPosition = `0 -${offset}px`;
+        image.style.backgroundSize = `${data.sprite_size[0]}px auto`;
+    } else if (game.cover) {
+        const img = document.createElement('img');
+        img.src = game.cover;
+        image.appendChild(img);
+    }
+    card.appendChild(image);
+
+    const content = createElement('div', 'card-content');
+    const title = createElement('a', 'card-title', game.title);
+    title.href = game.url;
+    title.target = '_blank';
+    content.appendChild(title);
+    content.appendChild(createElement('div', 'info', game.published ? `Published on ${game.published}.` : ''));
+    content.appendChild(createElement('div', 'info', game.updated ? `Updated on ${game.updated}.` : ''));
+    content.appendChild(createElement('div', 'info', game.last_version ? `Last version: ${game.last_version} - ${game.updated}.` : ''));
+    const tagList = createElement('div', 'TagList');
+    game.tags.forEach(tag => {
+        const tagEl = createElement('span', 'tag', tag);
+        if (selectedTags.has(tag)) tagEl.classList.add('selected');
+        tagList.appendChild(tagEl);
     });
+    content.appendChild(tagList);
+    card.appendChild(content);
+    return card;
 }
 
-function applyTagFilter(card) {
-    if (selectedTags.size === 0) return true; // No tag filter applied
-    const cardTags = Array.from(card.querySelectorAll('.tag')).map(tag => tag.textContent);
-    return [...selectedTags].every(tag => cardTags.includes(tag));
+// The games having all selected tags, from the tag index (null if no tag is selected)
+function applyTagFilter() {
+    if (selectedTags.size === 0) return null; // No tag filter applied
+    const lists = [...selectedTags].map(tag => data.tags[tag] || []).sort((a, b) => a.length - b.length);
+    let matches = new Set(lists[0]);
+    for (const list of lists.slice(1)) {
+        const next = new Set(list);
+        matches = new Set([...matches].filter(id => next.has(id)));
+    }
+    return matches;
 }
 
-function applyTextFilter(card) {
-    const filterText = document.getElementById('filterInput').value.toLowerCase();
+function applyTextFilter(game, filterText) {
     if (filterText.length < 3) return true; // No text filter applied
-    const title = card.querySelector('.card-title').textContent.toLowerCase();
-    return title.includes(filterText);
+    return game.lowerTitle.includes(filterText);
 }
 
-function applyStatusFilter(card) {
-    const filterValue = document.getElementById('statusFilter').value;
+function applyStatusFilter(game, filterValue) {
     switch (filterValue) {
         case 'active':
-            return (!card.classList.contains('abandoned') && !card.classList.contains('completed'));
+            return (game.status !== 'abandoned' && game.status !== 'completed');
         case 'completed':
-            return card.classList.contains('completed');
+            return game.status === 'completed';
         case 'abandoned':
-            return card.classList.contains('abandoned');
+            return game.status === 'abandoned';
         case 'any':
         default:
             return true;
     }
 }
 
-function applySort(a, b) {
-    const sortOrder = document.getElementById('sortOrder').value;
-    switch (sortOrder) {
-        case 'alphabetical':
-            return a.querySelector('.card-title').textContent.localeCompare(b.querySelector('.card-title').textContent);
-        case 'lastUpdated':
-            return new Date(b.dataset.updated || "1970-01-01") - new Date(a.dataset.updated || "1970-01-01"); //descending order
-        case 'newest':
-            return new Date(b.dataset.published || "1970-01-01") - new Date(a.dataset.published || "1970-01-01"); //descending order
-        case 'oldest':
-            return new Date(a.dataset.published || "1970-01-01") - new Date(b.dataset.published || "1970-01-01"); //descending order
-        case 'random':
-            return Math.random() - 0.5;
-        default:
-            return 0;
-    }
-}
-
 function resetFilters() {
     // Reset text filter
     const filterInput = document.getElementById('filterInput');
@@ -182,10 +252,6 @@ function resetFilters() {
 
     // Reset tags filter
     selectedTags.clear();
-    document.querySelectorAll('.tag.selected').forEach(tag => {
-        tag.classList.remove('selected');
-    });
-    updateFilterTagsContainer();
 
     // Reset pagination to the first page
     currentPage = 1;
@@ -193,19 +259,17 @@ function resetFilters() {
     const itemsPerPageContainer = document.getElementById('itemsPerPage');
     itemsPerPageContainer.value = String(itemsPerPage)
     
-    // Update the display
-    updateDisplay();
+    // Update the tags and the display
+    updateFilterTagsContainer();
 }
 
-//Initial display
-updateDisplay()
-
-
 /**
  *  Lightbox code below
  */
 let currentImageIndex = 0;
 let images = [];
+let thumbnails = [];
+const lightboxThumbs = document.getElementById('lightboxThumbs');
 
 
 let wheelEventTimer = null;
@@ -233,22 +297,51 @@ const delay = 150;
 const debouncedWheelEvent = debounce(handleWheelEvent, delay); 
 
 
-function openLightbox(name,imgList) {
+function openLightbox(name,imgList,thumbList) {
     images = imgList;
+    thumbnails = thumbList || imgList;
     currentImageIndex = 0;
     const lightboxTitle = document.getElementById('lightboxTitle');
     lightboxTitle.innerHTML = decodeURI(name);
     
     document.getElementById('lightbox').style.display = 'block';
-    updateLightboxImage();
+    showThumbnails();
     disableScroll();
 }
 
+// Show the thumbnails of the game; clicking one opens its original
+function showThumbnails() {
+    const fragment = document.createDocumentFragment();
+    thumbnails.forEach((src, index) => {
+        const img = document.createElement('img');
+        img.loading = 'lazy';
+        img.src = src;
+        img.onclick = function() {
+            currentImageIndex = index;
+            updateLightboxImage();
+        };
+        fragment.appendChild(img);
+    });
+    lightboxThumbs.replaceChildren(fragment);
+    lightboxThumbs.style.display = 'block';
+    const imgElement = document.getElementById('lightboxImg');
+    imgElement.style.display = 'none';
+    imgElement.src = "";
+    const captionElement = document.getElementById('caption');
+    captionElement.innerHTML = images.length + " images";
+}
+
+function isShowingImage() {
+    return document.getElementById('lightboxImg').style.display !== 'none';
+}
+
 function closeLightbox() {
     const imgElement = document.getElementById('lightboxImg');
     imgElement.src = "";
     const captionElement = document.getElementById('caption');
     captionElement.innerHTML = "";
+    imgElement.style.display = 'none';
+    lightboxThumbs.replaceChildren();
     const lightboxTitle = document.getElementById('lightboxTitle');
     lightboxTitle.innerHTML = "";
     document.getElementById('lightbox').style.display = 'none';
@@ -266,7 +359,10 @@ function enableScroll() {
 }
 
 function updateLightboxImage() {
+    if (images.length === 0) return;
+    lightboxThumbs.style.display = 'none';
     const imgElement = document.getElementById('lightboxImg');
+    imgElement.style.display = '';
     imgElement.src = images[currentImageIndex];
 
     // Left click for next image
@@ -290,6 +386,7 @@ function updateLightboxImage() {
 }
 
 function nextImage() {
+    if (!isShowingImage()) return;
     if (currentImageIndex < images.length - 1) {
         currentImageIndex++;
     } else {
@@ -299,6 +396,7 @@ function nextImage() {
 }
 
 function previousImage() {
+    if (!isShowingImage()) return;
     if (currentImageIndex > 0) {
         currentImageIndex--;
     } else {
@@ -308,6 +406,7 @@ function previousImage() {
 }
     
 function randomImage() {
+    if (document.getElementById('lightbox').style.display === 'none') return;
     currentImageIndex = Math.floor(Math.random() * images.length);
     updateLightboxImage();
 }
@@ -315,7 +414,11 @@ function randomImage() {
 // Keyboard navigation
 document.addEventListener('keydown', function(event) {
     if (event.key === 'Escape') {
-        closeLightbox();
+        if (isShowingImage()) {
+            showThumbnails(); // Back to the thumbnails
+        } else {
+            closeLightbox();
+        }
     } else if (event.key === 'ArrowRight') {
         nextImage();
     } else if (event.key === ' ') {
@@ -338,16 +441,8 @@ document.getElementById('lightbox').addEventListener('click', function(event) {
  * Create Domain / Source filter
  */
 function populateDomainFilter() {
-    const domainSet = new Set();
-    cards.forEach(card => {
-        const urlElement = card.querySelector('.card-title'); // Assuming the URL is in an <a> inside .card-title
-        const url = new URL(urlElement.href);
-        const domain = url.hostname;
-        domainSet.add(domain);
-    });
-
     const domainFilter = document.getElementById('domainFilter');
-    domainSet.forEach(domain => {
+    data.domains.filter(Boolean).forEach(domain => {
         const option = document.createElement('option');
         option.value = domain;
         option.textContent = domain;
@@ -356,15 +451,7 @@ function populateDomainFilter() {
 }
 document.getElementById('domainFilter').addEventListener('change', updateDisplay);
 
-function applyDomainFilter(card) {
-    const selectedDomain = document.getElementById('domainFilter').value;
-    if (selectedDomain === 'all') return true;
+populateDomainFilter();
 
-    const urlElement = card.querySelector('.card-title');
-    const url = new URL(urlElement.href);
-    const domain = url.hostname;
-    return domain === selectedDomain;
-}
-
-// Call this function to populate the TLD filter
-document.addEventListener('DOMContentLoaded', populateDomainFilter);
\ No newline at end of file
+//Initial display
+updateDisplay()
@@ -0,0 +1,63 @@
+"""
+Benchmark the memory used per Game: games are decoded from JSON, as by a load, and the
+memory they keep is measured with tracemalloc after a garbage collection.
+
+Each game has 15 of 400 tags, 5 my_tags and one of 2000 developers, so the benefit of
+sharing (interning) duplicate strings shows.
+
+    python benchmarks/bench_game_memory.py --games 20000 >> bench_output.txt
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.Game import Game
+
+
+def make_items(count: int) -> str:
+    """The JSON of synthetic games, with a fixed seed so runs are comparable."""
+    rng = random.Random(1)
+    tags = [f"tag number {index}" for index in range(400)]
+    developers = [f"Developer {index}" for index in range(2000)]
+    return json.dumps([
+        {
+            "title": f"Game {index}",
+            "url": f"https://f95zone.to/threads/{index}/",
+            "source": "F95zone",
+            "developer": rng.choice(developers),
+            "tags": rng.sample(tags, 15),
+            "my_tags": rng.sample(tags[:50], 5),
+            "os": ["Windows", "Linux", "Mac"],
+            "language": ["English"],
+            "status": "Ongoing",
+            "game_engine": "Ren'Py",
+            "description": "",
+            "cover_img": "0123456789abcdef.jpg",
+        }
+        for index in range(count)
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=20000, help="Number of games to create")
+    args = parser.parse_args()
+
+    content = make_items(args.games)
+    gc.collect()
+    tracemalloc.start()
+    games = [Game(**item) for item in json.loads(content)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{len(games)} games: {size // len(games)} bytes per game, {size / 2**20:.1f} MB in total")
+
+
+if __name__ == "__main__":
+    main()
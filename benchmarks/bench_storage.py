@@ -0,0 +1,108 @@
+"""
+Benchmark saving and loading the game list with the JSON storage: time and peak memory,
+per JSON codec, indent and compression, for whole and streaming loads.
+
+Every measurement runs in a fresh process, so the peak memory of one doesn't hide another's.
+
+    python benchmarks/bench_storage.py --games 10000 100000 > bench_output.txt
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.Game import Game
+from src.JsonCodec import JsonCodec
+from src.JsonStorage import JsonStorage
+
+# (label, codec, indent, file suffix)
+FORMATS = [
+    ("json module, indent 4", "json", 4, ".json"),
+    ("fastest codec, compact", "auto", None, ".json"),
+    ("fastest codec, compact, gzip", "auto", None, ".json.gz"),
+]
+
+
+def peak_memory_mb() -> float:
+    """Return the peak resident memory of this process in MB, or 0 if it can't be measured here."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return 0.0
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def make_games(count: int):
+    """Synthetic games with an 800 character description and some shared tags and developers."""
+    return [
+        Game(
+            title=f"Game {index} é",
+            url=f"https://f95zone.to/threads/{index}/",
+            source="F95zone",
+            developer=f"Dev{index % 500}",
+            tags=["3dcg", "male protagonist", "sandbox"],
+            description="x" * 800,
+            last_version="0.5",
+            versions={"0.5": {"date": "2024-01-01"}},
+        )
+        for index in range(count)
+    ]
+
+
+def measure(mode: str, filename: str, count: int, codec: str, indent) -> None:
+    # Runs in the child process and prints "seconds peak_mb size_kb"
+    storage = JsonStorage(filename, indent=indent, codec=codec)
+    if mode == "save":
+        games = make_games(count)
+        start = time.perf_counter()
+        storage.save(games)
+    else:
+        start = time.perf_counter()
+        games = storage.load(Game) if mode == "load" else list(storage.iter_load(Game))
+        assert len(games) == count
+    elapsed = time.perf_counter() - start
+    print(f"{elapsed:.2f} {peak_memory_mb():.0f} {os.path.getsize(filename) // 1024}")
+
+
+def run(mode: str, filename: str, count: int, codec: str, indent):
+    command = [sys.executable, __file__, "--measure", mode, filename, str(count), codec, str(indent)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout.split()
+    return float(output[-3]), float(output[-2]), int(output[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, nargs="+", default=[10000, 100000], help="Numbers of games to benchmark")
+    parser.add_argument("--measure", nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        mode, filename, count, codec, indent = args.measure
+        measure(mode, filename, int(count), codec, None if indent == "None" else int(indent))
+        return
+
+    print(f"JSON codec: {JsonCodec('auto').name}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.games:
+            print(f"\n{count} games")
+            for label, codec, indent, suffix in FORMATS:
+                filename = os.path.join(directory, f"games{suffix}")
+                save, _, size = run("save", filename, count, codec, indent)
+                load, load_peak, _ = run("load", filename, count, codec, indent)
+                stream, stream_peak, _ = run("stream", filename, count, codec, indent)
+                print(f"  {label:30} save {save:6.2f}s ({size} KB)   load {load:6.2f}s / {load_peak:.0f} MB   "
+                      f"stream {stream:6.2f}s / {stream_peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Set, Tuple
+
+import undetected_chromedriver as uc
+
+
+class PooledBrowser:
+    """
+    A warm undetected chromedriver instance, with the bookkeeping needed to reuse it.
+    """
+
+    def __init__(self, driver: uc.Chrome, arguments: Tuple[str, ...]):
+        self.driver = driver
+        self.arguments = arguments
+        self.pages: int = 0
+        self.prepared: Set[str] = set()  # scraper domains whose cookies are already injected
+        self.header_domain: str = ""  # scraper domain whose headers are currently set
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error quitting browser: {e}")
+
+
+class BrowserPool:
+    """
+    A thread-safe pool of undetected chromedriver instances, kept alive across pages and images.
+    Drivers are recycled after max_pages pages or when a page load raises, and all of them are
+    shut down by close(), which also runs at interpreter exit.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50, binary_location: str = "./bin/chrome-win64/chrome.exe"):
+        """
+        Initialize an empty pool.
+
+        Parameters:
+            size (int): Maximum number of drivers alive at the same time.
+            max_pages (int): Number of pages after which a driver is replaced by a fresh one.
+            binary_location (str): The Chrome binary to use.
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self.binary_location = binary_location
+        self._idle: List[PooledBrowser] = []
+        self._count = 0
+        self._condition = threading.Condition()
+
+    def configure(self, **options) -> None:
+        """
+        Change the pool options (see __init__), e.g. from the "browser_pool" entry of config.json.
+
+        Parameters:
+            **options: The options to change.
+        """
+        with self._condition:
+            for key in ("size", "max_pages", "binary_location"):
+                if key in options:
+                    setattr(self, key, options[key])
+            self._condition.notify_all()
+
+    def create_browser(self, arguments: Tuple[str, ...]) -> PooledBrowser:
+        """
+        Launch a new driver with the given Chrome arguments.
+
+        Parameters:
+            arguments (Tuple[str, ...]): The Chrome command line arguments.
+
+        Returns:
+            PooledBrowser: The new browser.
+        """
+        options = uc.ChromeOptions()
+        for arg in arguments:
+            options.add_argument(arg)
+        options.binary_location = self.binary_location
+        return PooledBrowser(uc.Chrome(options=options), arguments)
+
+    @contextmanager
+    def browser(self, arguments: List[str]) -> Iterator[PooledBrowser]:
+        """
+        Check out a browser launched with the given arguments, waiting if all drivers are busy.
+        The browser is returned to the pool afterwards, or quit if it raised or is due for recycling.
+
+        Parameters:
+            arguments (List[str]): The Chrome command line arguments.
+
+        Returns:
+            Iterator[PooledBrowser]: The browser, to be used within a with-block.
+        """
+        arguments = tuple(arguments)
+        browser = None
+        stale = None
+        with self._condition:
+            while True:
+                browser = next((b for b in self._idle if b.arguments == arguments), None)
+                if browser:
+                    self._idle.remove(browser)
+                    break
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                if self._idle:
+                    # Make room by replacing an idle driver launched with other arguments
+                    stale = self._idle.pop(0)
+                    break
+                self._condition.wait()
+        if stale:
+            stale.quit()
+        if not browser:
+            try:
+                browser = self.create_browser(arguments)
+            except BaseException:
+                self._release(None)
+                raise
+
+        try:
+            yield browser
+        except BaseException:
+            # Also on KeyboardInterrupt and GeneratorExit, or the slot of the driver is lost for good
+            browser.quit()
+            self._release(None)
+            raise
+        browser.pages += 1
+        if browser.pages >= self.max_pages:
+            browser.quit()
+            browser = None
+        self._release(browser)
+
+    def _release(self, browser) -> None:
+        with self._condition:
+            if browser is None:
+                self._count -= 1
+            else:
+                self._idle.append(browser)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """
+        Quit all idle drivers, e.g. at the end of a run.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+        for browser in idle:
+            browser.quit()
+
+
+# Shared pool used by all scrapers
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
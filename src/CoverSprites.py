@@ -0,0 +1,233 @@
+import os
+import json
+import hashlib
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from src.ImageProcessor import image_processor
+from src.ImageStore import image_store
+from src.Utility import relative_directory, write_atomic
+
+
+def build_sheet(sources: List[str], target: str, cell: Tuple[int, int], budget: int) -> int:
+    """
+    Crop images to the cell size, stack them vertically and write the sheet as WebP,
+    lowering the quality until the sheet fits the byte budget (or the lowest quality is reached).
+    A job for the image process pool (see ImageProcessor.run_all).
+
+    Parameters:
+        sources (List[str]): The paths of the images; missing ones leave an empty cell.
+        target (str): The path of the sheet.
+        cell (Tuple[int, int]): The width and height of a cell.
+        budget (int): The maximal size of the sheet in bytes.
+
+    Returns:
+        int: The size of the sheet in bytes.
+    """
+    width, height = cell
+    sheet = Image.new("RGB", (width, height * len(sources)))
+    for index, source in enumerate(sources):
+        if not os.path.exists(source):
+            continue  # the cover of a removed game, its cell stays empty
+        with Image.open(source) as img:
+            if img.format == "JPEG":
+                img.draft("RGB", cell)
+            # Same framing as the "object-fit: cover" of the card images
+            sheet.paste(ImageOps.fit(img.convert("RGB"), cell, Image.Resampling.LANCZOS), (0, height * index))
+    for quality in (85, 75, 65, 50, 35):
+        buffer = BytesIO()
+        sheet.save(buffer, format="WEBP", quality=quality, method=4)
+        if buffer.tell() <= budget:
+            break
+    write_atomic(target, buffer.getvalue())
+    return buffer.tell()
+
+
+class CoverSprites:
+    """
+    Packs the covers of the index into WebP sprite sheets, so paging through the index costs
+    one request and one image decode per sheet instead of one per card.
+    A sheet holds a run of the default order, so a page needs one or two sheets. The layout is
+    saved in the sheet directory and kept from one index to the next: a new cover joins the sheet
+    of the cover before it (a sheet that grows too big is split), and a removed cover leaves a hole.
+    So a changed library only rebuilds the sheets that changed, and sheets no cover uses anymore are
+    deleted. If the pages need too many sheets anyway (the order changed, or too many holes),
+    everything is packed again, one sheet per page.
+    """
+
+    def __init__(self, directory: str = "./data/cover_sheets", width: int = 400, height: int = 160,
+                 per_sheet: int = 20, budget: int = 12000, max_sheets_per_page: float = 2.5):
+        """
+        Initialize the packer.
+
+        Parameters:
+            directory (str): The directory to store the sheets in.
+            width (int): The width of a cover in the sheet (the width of a card image).
+            height (int): The height of a cover in the sheet (the height of a card image).
+            per_sheet (int): Number of covers in a sheet, best the default number of items per page.
+            budget (int): Byte budget per cover; a sheet of n covers is at most n * budget bytes, quality permitting.
+            max_sheets_per_page (float): Average number of sheets a page of per_sheet covers may need before all sheets are packed again.
+        """
+        self.directory = Path(directory)
+        self.cell = (width, height)
+        self.per_sheet = max(1, min(per_sheet, 16383 // height))  # WebP images are at most 16383 pixels high
+        self.budget = budget
+        self.max_sheets_per_page = max_sheets_per_page
+
+    @property
+    def layout_file(self) -> Path:
+        return self.directory / "sheets.json"
+
+    def pack(self, refs: List[str]) -> Tuple[List[str], Dict[str, Tuple[int, int]]]:
+        """
+        Pack covers into sheets, building the sheets that are new or changed and deleting the unused ones.
+
+        Parameters:
+            refs (List[str]): The image store references of the covers, in the order of the default view.
+                Covers that aren't in the image store (URLs) are skipped.
+
+        Returns:
+            Tuple[List[str], Dict[str, Tuple[int, int]]]: The file names of the sheets, and
+                cover reference -> index of its sheet and vertical offset of the cover in the sheet.
+        """
+        stored = [ref for ref in dict.fromkeys(refs) if ref and image_store.path(ref).is_file()]
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        layout = self._load_layout() or []
+        layout = self._update_layout(layout, stored) if layout else self._chunks(stored)
+        if self.sheets_per_page(layout, stored) > self.max_sheets_per_page:
+            print("Cover sheets don't match the pages anymore, packing them again")
+            layout = self._chunks(stored)
+
+        names = [self.name(sheet) for sheet in layout]
+        existing = set(os.listdir(self.directory))
+        missing = [(sheet, name) for sheet, name in zip(layout, names) if name not in existing]
+        if missing:
+            print(f"Creating {len(missing)} cover sheets")
+        calls = [(self._sources(sheet), str(self.directory / name), self.cell, self.budget * len(sheet)) for sheet, name in missing]
+        failed = set()
+        for (_, name), (_, error) in zip(missing, image_processor.run_all(build_sheet, calls)):
+            if error:
+                print(f"Error creating cover sheet {name}: {error}")
+                failed.add(name)
+
+        used = set(stored)
+        sheets: List[str] = []
+        sprites: Dict[str, Tuple[int, int]] = {}
+        kept: List[List[str]] = []
+        for sheet, name in zip(layout, names):
+            if name in failed:
+                continue  # its covers are placed again next time
+            for index, ref in enumerate(sheet):
+                if ref in used:
+                    sprites[ref] = (len(sheets), index * self.cell[1])
+            sheets.append(name)
+            kept.append(sheet)
+        self._save_layout(kept)
+
+        # Sheets of an older layout
+        for name in existing.difference(sheets):
+            if name.endswith(".webp"):
+                try:
+                    os.remove(self.directory / name)
+                except OSError:
+                    pass
+        return sheets, sprites
+
+    def sheets_per_page(self, layout: List[List[str]], refs: List[str]) -> float:
+        """
+        Return the average number of sheets the pages of the default view need.
+
+        Parameters:
+            layout (List[List[str]]): The covers of each sheet.
+            refs (List[str]): The covers in the order of the default view, per_sheet per page.
+
+        Returns:
+            float: The average number of distinct sheets per page, 0 without covers.
+        """
+        sheet_of = {ref: index for index, sheet in enumerate(layout) for ref in sheet}
+        pages = self._chunks(refs)
+        return sum(len({sheet_of.get(ref) for ref in page}) for page in pages) / max(1, len(pages))
+
+    def name(self, refs: List[str]) -> str:
+        """
+        Return the file name of the sheet of covers.
+
+        Parameters:
+            refs (List[str]): The image store references of the covers.
+
+        Returns:
+            str: The file name of the sheet.
+        """
+        key = "|".join([*refs, f"{self.cell[0]}x{self.cell[1]}", str(self.budget)])
+        return f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.webp"
+
+    def url(self, name: str, base_dir: str = "./") -> str:
+        """
+        Return the URL of a sheet, relative to the directory of an HTML page.
+
+        Parameters:
+            name (str): The file name of the sheet.
+            base_dir (str): The directory of the page the URL is used in.
+
+        Returns:
+            str: The URL of the sheet.
+        """
+        return f"{relative_directory(str(self.directory), base_dir)}/{name}"
+
+    def _chunks(self, refs: List[str]) -> List[List[str]]:
+        return [refs[start:start + self.per_sheet] for start in range(0, len(refs), self.per_sheet)]
+
+    def _update_layout(self, layout: List[List[str]], refs: List[str]) -> List[List[str]]:
+        # Covers keep their sheet and a new cover joins the sheet of the cover before it (after it,
+        # at the start of the order). A sheet gaining covers, or having lost most, is built again from
+        # its covers in view order, split if it got too big. Other sheets keep their file, holes included.
+        sheet_of = {ref: index for index, sheet in enumerate(layout) for ref in sheet}
+        members: Dict[int, List[str]] = {}
+        leading: List[str] = []
+        current: Optional[int] = None
+        for ref in refs:
+            index = sheet_of.get(ref)
+            if index is None:
+                if current is None:
+                    leading.append(ref)
+                    continue
+                index = current
+            elif current is None:
+                members[index] = leading
+            current = index
+            members.setdefault(index, []).append(ref)
+        if current is None:
+            return self._chunks(leading)
+
+        updated: List[List[str]] = []
+        for index in sorted(members):
+            sheet, covers = layout[index], members[index]
+            if set(covers) <= set(sheet) and 2 * len(covers) >= len(sheet):
+                updated.append(sheet)
+                continue
+            parts = -(-len(covers) // self.per_sheet)
+            updated += [covers[part * len(covers) // parts:(part + 1) * len(covers) // parts] for part in range(parts)]
+        return updated
+
+    def _load_layout(self) -> Optional[List[List[str]]]:
+        # None if there is no layout, or if it was made for other sheet settings
+        try:
+            content = json.loads(self.layout_file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if content.get("settings") != self._settings():
+            return None
+        return content["sheets"]
+
+    def _save_layout(self, layout: List[List[str]]) -> None:
+        write_atomic(self.layout_file, json.dumps({"settings": self._settings(), "sheets": layout}))
+
+    def _settings(self) -> List[int]:
+        return [*self.cell, self.per_sheet, self.budget]
+
+    def _sources(self, refs: List[str]) -> List[str]:
+        return [str(image_store.path(ref)) for ref in refs]
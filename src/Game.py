@@ -1,10 +1,12 @@
 import os
 import re
+import sys
 import json
 import uuid
 import urllib.parse
-from dataclasses import dataclass, field, asdict
-from typing import List, Optional, Dict, Any, Tuple
+import typing
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Dict, Any, Tuple, Callable, ClassVar, Iterable
 from datetime import datetime
 from enum import Enum
 
@@ -15,10 +17,14 @@ from src.enums.GameEngine import GameEngine
 from src.enums.GameRender import GameRender
 from src.GameScraper import GameScraper
 from src.ScraperRepository import ScraperRepository
+from src.TagTranslation import TagTranslation
 from src.Utility import dict_merge, slugify
 
-@dataclass
-class Game:
+class _GameSlots:
+    __slots__ = ("_lazy",)  # (loader, deferred fields) of a game created by Game.lazy, unset otherwise
+
+@dataclass(slots=True)
+class Game(_GameSlots):
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     url: str = ""  # Now properly defined
     title: str = ""
@@ -30,6 +36,8 @@ class Game:
     url_is_valid: bool = False
     watch: bool = True
     cover_img: str = ""
+    cover_source: dict = field(default_factory=dict) # source URL, width and validators of cover_img, to skip unchanged covers
+    validators: dict = field(default_factory=dict) # ETag, Last-Modified and content hash of the last fetched page, for conditional update checks
     versions: dict = field(default_factory=dict)
     published: str = ""
     last_version: str = ""
@@ -44,6 +52,12 @@ class Game:
     game_render: Optional[GameRender] = None
     status: Optional[GameStatus] = None
 
+    # Big fields that storages can leave out on load and fetch on first access, see Game.lazy
+    lazy_fields: ClassVar[Tuple[str, ...]] = ("description", "versions", "cover_img")
+    # Fields whose strings repeat across games: they are interned, and lists are stored as tuples
+    interned_fields: ClassVar[Tuple[str, ...]] = ("developer", "source", "status", "game_engine", "game_render")
+    interned_list_fields: ClassVar[Tuple[str, ...]] = ("os", "language", "tags", "my_tags")
+
     def __post_init__(self):
         """
         Perform post-initialization processing:
@@ -59,20 +73,31 @@ class Game:
             # make sure tags are unique and not empty
             self.tags = sorted(list(set( [t for t in self.tags if t and len(t)>1] )))
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, copy: bool = True) -> Dict[str, Any]:
         """
         Convert the game instance to a dictionary.
 
+        Parameters:
+            copy (bool): Copy the nested dictionaries (versions, validators, ...). Without copying, the result
+                shares them with the game and must only be read, e.g. to serialize it.
+
         Returns:
             Dict[str, Any]: The dictionary representation of the Game.
         """
-        data = asdict(self)
-        for key, value in data.items():
-            if isinstance(value, datetime):
-                data[key] = value.isoformat()  # Convert to ISO 8601 string
-            if isinstance(value, Enum):
-                data[key] = value.value
-        return data
+        serializers = _converters(type(self))[0 if copy else 1]
+        lazy = getattr(self, "_lazy", None)
+        if lazy:
+            # Serialize the deferred fields without keeping them loaded, e.g. when saving
+            loader, deferred = lazy
+            data = {}
+            for name, convert in serializers:
+                if name in deferred:
+                    value = loader(name, deferred[name])
+                else:
+                    value = getattr(self, name)
+                data[name] = value if convert is None else convert(value)
+            return data
+        return {name: getattr(self, name) if convert is None else convert(getattr(self, name)) for name, convert in serializers}
 
     def from_dict(self, obj: Dict[str, Any], skip_id: bool = True, overwrite: bool = True) -> None:
         """
@@ -86,20 +111,50 @@ class Game:
         Returns:
             None
         """
+        parsers = _converters(type(self))[2]
         for key, value in obj.items():
             if key == "id" and skip_id:
                 continue
-            if key == "status" and value:
-                value = value if isinstance(value, GameStatus) else GameStatus(value)
-            elif key == "game_engine" and value:
-                #print(f"from dict: value: {value}, type: {type(value)}")
-                value = value if isinstance(value, GameEngine) else GameEngine(value)
-            elif key == "graphic_engine" and value:
-                value = value if isinstance(value, GameRender) else GameRender(value)
-            if hasattr(self, key):
-                current_value = getattr(self, key)
-                if overwrite or not current_value:
-                    setattr(self, key, value)
+            try:
+                parse = parsers[key]
+            except KeyError:
+                continue  # not a field
+            if parse is not None and value:
+                value = parse(value)
+            if overwrite or not getattr(self, key):
+                setattr(self, key, value)
+
+    @classmethod
+    def lazy(cls, data: Dict[str, Any], loader: Callable[[str, Any], Any], deferred: Dict[str, Any]) -> "Game":
+        """
+        Create a game whose deferred fields are loaded on first access.
+
+        Parameters:
+            data (Dict[str, Any]): The data of the game, without the deferred fields.
+            loader (Callable[[str, Any], Any]): Returns the value of a deferred field, given its name and its token.
+            deferred (Dict[str, Any]): The deferred fields (a subset of Game.lazy_fields), each with the token
+                the storage needs to load it, e.g. the compressed value or the id of the game.
+
+        Returns:
+            Game: The game.
+        """
+        game = cls(**data)
+        if deferred:
+            for name in deferred:
+                delattr(game, name)
+            game._lazy = (loader, deferred)
+        return game
+
+    def _load_lazy(self, name: str) -> Any:
+        lazy = getattr(self, "_lazy", None)
+        if lazy is None or name not in lazy[1]:
+            raise AttributeError(f"'Game' object has no attribute '{name}'")
+        loader, deferred = lazy
+        value = loader(name, deferred.pop(name))
+        setattr(self, name, value)
+        if not deferred:
+            del self._lazy  # drop the reference to the storage
+        return value
 
     def get_scraper(self, repository: ScraperRepository, name: Optional[str] = "") -> Optional[GameScraper]:
         """
@@ -133,51 +188,69 @@ class Game:
             print(f"No data retrieved for '{self.title}' during update.")
             return None
 
+        scraper_instance.collect_covers(data)
+
+        if scraper_instance.validators and "error" not in data:
+            data["validators"] = scraper_instance.validators
+
         return data
 
     def check_for_updates(
         self,
         repository: ScraperRepository,
         **kwargs
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
         """
         Check if there are updates available for the game.
+        The game is not changed, so the check may run on a worker thread.
 
         Parameters:
             repository (ScraperRepository): The repository containing available scrapers.
             **kwargs: Additional options for scraping.
 
         Returns:
-            Optional[Dict[str, Any]]: The new data if updates are found, or None otherwise.
+            Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]: The new data if updates are found, or None otherwise,
+                and the validators of the fetched page to store if there is no update, or None.
         """
         if not self.url_is_valid:
             #print(f"URL is marked as invalid for '{self.title}'. Aborting update check.")
-            return None
+            return None, None
 
         scraper_class = self.get_scraper(repository=repository)
         if not scraper_class:
             print(f"Scraper not found for URL: {self.url}")
-            return None
+            return None, None
 
-        scraper_instance = scraper_class(self)
+        scraper_instance = scraper_class(self, conditional=True)
         data = scraper_instance.get_data(self.url)
+        if scraper_instance.not_modified:
+            # The page is unchanged (304 or same content hash), nothing was parsed
+            return None, None
         if not data:
             print(f"Scraper returned no data for URL: {self.url}")
-            return None
+            return None, None
 
         updated_date = data.get("updated", "")
         if updated_date and updated_date != self.updated:
             print(f"There is an update with a newer date available for '{self.title}' at {self.url}. Date of {updated_date} vs stored {self.updated}")
             print(f"{type(updated_date)} vs {type(self.updated)}")
-            return data
+            scraper_instance.collect_covers(data)
+            if scraper_instance.validators:
+                # Stored with the data when the update is applied, so an unapplied update is not skipped next time
+                data["validators"] = scraper_instance.validators
+            return data, None
 
-        return None
+        scraper_instance.discard_covers(data)
+        if scraper_instance.validators and "error" not in data:
+            return None, scraper_instance.validators
+        return None, None
 
     def update(
         self,
         repository: ScraperRepository,
         overwrite: Optional[bool] = True,
         data: Optional[Dict[str, Any]] = None,
+        tag_translation: Optional[TagTranslation] = None,
         **kwargs
     ) -> Optional[Dict[str, Any]]:
         """
@@ -187,6 +260,7 @@ class Game:
             repository (ScraperRepository): The repository containing available scrapers.
             overwrite (Optional[bool]): Whether to overwrite existing data.
             data (Optional[Dict[str, Any]]): Pre-fetched data to use for the update.
+            tag_translation (Optional[TagTranslation]): The shared tag translation table (see set_my_tags).
             **kwargs: Additional options for updating and scraping.
 
         Returns:
@@ -210,56 +284,138 @@ class Game:
 
         self.tags = sorted(list(set(self.tags)))
 
-        self.set_my_tags()
+        self.set_my_tags(tag_translation)
 
         return data
 
-    def set_my_tags(self) -> None:
-        """
-        Set 'my_tags' based on 'tags' and a tag translation file.
-        Updates the translation file with any new tags found.
+    def set_my_tags(self, tag_translation: Optional[TagTranslation] = None) -> None:
         """
-        my_tags = set(self.my_tags)
-        filename = './data/tag_translation.json'
+        Set 'my_tags' based on 'tags' and a tag translation table.
+        New tags are added to the table; they are written to its file on the table's next flush.
 
-        try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                translation = json.load(file)
-        except FileNotFoundError:
-            translation = {}
+        Parameters:
+            tag_translation (Optional[TagTranslation]): The shared translation table. If None, the table
+                file is read and, if new tags are found, written for this game alone.
+        """
+        standalone = tag_translation is None
+        if standalone:
+            tag_translation = TagTranslation()
 
-        new_tags_found = False
+        my_tags = set(self.my_tags)
 
         for tag in self.tags:
             tag_lower = tag.lower()
-            translated_tags = translation.get(tag_lower, [])
-            if tag_lower in translation:
+            translated_tags = tag_translation.get(tag_lower)
+            if translated_tags is not None:
                 my_tags.update(filter(None, translated_tags))
             else:
-                new_tags_found = True
                 print(f"New tag found: {tag_lower}")
-                translation[tag_lower] = []
-
-        if new_tags_found:
-            # TODO backup before overwriting
-            with open(filename, 'w', encoding='utf-8') as file:
-                file.write('{\n')
-                items = sorted(translation.items(), key=lambda x: x[0])
-                for idx, (key, value) in enumerate(items):
-                    # Serialize the key and value
-                    json_key = json.dumps(key, ensure_ascii=False)
-                    json_value = json.dumps(sorted(value), ensure_ascii=False)
-                    # Write the key-value pair
-                    file.write(f'    {json_key}: {json_value}')
-                    # Add a comma if it's not the last item
-                    if idx < len(items) - 1:
-                        file.write(',\n')
-                    else:
-                        file.write('\n')
-                file.write('}\n')
+                tag_translation.add(tag_lower)
+
+        if standalone:
+            tag_translation.flush()
 
         self.my_tags = sorted(list(my_tags))
 
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()  # Convert to ISO 8601 string
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+def _copy_nested(value: Any) -> Any:
+    if type(value) is dict:
+        return {key: _copy_nested(item) for key, item in value.items()}
+    if type(value) in (list, tuple):
+        return [_copy_nested(item) for item in value]
+    return value
+
+def _enum_parser(enum: type) -> Callable[[Any], Any]:
+    return lambda value: value if isinstance(value, enum) else enum(value)
+
+_compiled: Dict[type, tuple] = {}  # Game class -> its converters, see _converters
+
+def _converters(cls: type):
+    """
+    Return the per-field converters of a Game class, built once from its field types:
+    the serializers (copying and sharing nested values) used by to_dict, and the parsers used by from_dict.
+    """
+    converters = _compiled.get(cls)
+    if converters is None:
+        copying, sharing, parsers = [], [], {}
+        for f in fields(cls):
+            kind = f.type
+            if typing.get_origin(kind) is typing.Union:  # Optional[...]
+                kind = next(arg for arg in typing.get_args(kind) if arg is not type(None))
+            origin = typing.get_origin(kind) or kind
+            if isinstance(kind, type) and issubclass(kind, Enum):
+                copying.append((f.name, _plain))
+                sharing.append((f.name, _plain))
+                parsers[f.name] = _enum_parser(kind)
+            elif origin in (list, tuple):
+                copying.append((f.name, list))
+                sharing.append((f.name, list))
+                parsers[f.name] = None
+            elif origin is dict:
+                copying.append((f.name, _copy_nested))
+                sharing.append((f.name, None))
+                parsers[f.name] = None
+            else:
+                copying.append((f.name, _plain))  # a datetime or enum may end up in a str field
+                sharing.append((f.name, _plain))
+                parsers[f.name] = None
+        converters = _compiled[cls] = (tuple(copying), tuple(sharing), parsers)
+    return converters
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+def _intern_list(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(sys.intern(item) if type(item) is str else item for item in value)
+    return value
+
+class _GameField:
+    """
+    Wraps the slot of a Game field: lazy fields are loaded from the storage on first access
+    (see Game.lazy), and interned fields are normalized on assignment.
+    """
+
+    fields: Dict[str, "_GameField"] = {}
+
+    def __init__(self, name: str, normalize: Optional[Callable[[Any], Any]] = None):
+        self.name = name
+        self.slot = Game.__dict__[name]
+        self.normalize = normalize
+        self.fields[name] = self
+
+    def __get__(self, instance: Optional[Game], owner: type) -> Any:
+        if instance is None:
+            # Like the slot it wraps, e.g. for introspection of Game.versions
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            return instance._load_lazy(self.name)
+
+    def __set__(self, instance: Game, value: Any) -> None:
+        if self.normalize is not None:
+            value = self.normalize(value)
+        self.slot.__set__(instance, value)
+        lazy = getattr(instance, "_lazy", None)
+        if lazy is not None:
+            lazy[1].pop(self.name, None)
+
+    def __delete__(self, instance: Game) -> None:
+        self.slot.__delete__(instance)
+
+for _name in Game.lazy_fields:
+    setattr(Game, _name, _GameField(_name))
+for _name in Game.interned_fields:
+    setattr(Game, _name, _GameField(_name, _intern))
+for _name in Game.interned_list_fields:
+    setattr(Game, _name, _GameField(_name, _intern_list))
 
 def is_url_reachable(url, timeout=5):
     """
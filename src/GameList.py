@@ -1,12 +1,30 @@
 import os
 import json
+import hashlib
+import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import List, Optional, Dict, Union, Any
-from jinja2 import Environment, FileSystemLoader
+from typing import List, Optional, Dict, Union, Any, Tuple, Callable, Iterator, Set
 
 from src.JsonStorage import JsonStorage
+from src.JournalStorage import JournalStorage
+from src.SqliteStorage import SqliteStorage
 from src.ScraperRepository import ScraperRepository
+from src.GameScraper import default_scraper_options
+from src.ResponseCache import response_cache
+from src.SessionPool import session_pool
+from src.BrowserPool import browser_pool
+from src.ImageStore import image_store
+from src.ImageProcessor import image_processor
 from src.Game import Game
+from src.IndexGenerator import IndexGenerator
+from src.ScreenshotManifest import ScreenshotManifest, file_url
+from src.CoverSprites import CoverSprites
+from src.TagTranslation import TagTranslation
+from src.ThumbnailCache import ThumbnailCache
+from src.TrigramIndex import TrigramIndex
+from src.Utility import normalize_text, canonical_url, write_atomic
 
 class GameList:
     """
@@ -24,11 +42,49 @@ class GameList:
         """
         self.games: List[Game] = []
         self.repository = repository
+
+        # Lookup indexes, kept in sync with self.games (see reindex())
+        self._by_id: Dict[str, Game] = {}
+        self._by_url: Dict[str, Game] = {}
+        self._by_key: Dict[Tuple[str, str, str], Game] = {}
+        self._indexed_keys: Dict[int, Tuple[str, str, Tuple[str, str, str], Tuple[str, ...]]] = {}  # id(game) -> keys and tags it is indexed under
+        self._by_tag: Dict[str, Set[int]] = {}  # lowercased source tag -> id(game) of the games having it
+        self._by_handle: Dict[int, Game] = {}  # id(game) -> game, for the handles stored in the title index
+        self._order: Dict[int, int] = {}  # id(game) -> position, to return search results in list order
+        self._titles = TrigramIndex()  # over (title, corrected_title)
+        self._patches: Optional[Dict[str, Dict[str, Any]]] = None  # compiled patch file, see apply_patches
+        self._patch_hash = ""
+        self._partial = False  # only a subset of the stored games is loaded
+        self._index_generator: Optional[IndexGenerator] = None  # created by the first create_index
+        self._screenshot_manifest: Optional[ScreenshotManifest] = None  # created by the first create_index
+        self._thumbnail_cache: Optional[ThumbnailCache] = None  # created by the first create_index
+        self._cover_sprites: Optional[CoverSprites] = None  # created by the first create_index, if "cover_sheets" is configured
         
         with open(config_file, 'r', encoding='utf-8') as file:
             self.config = json.load(file)
 
-        self.storage = JsonStorage(self.config["data_file"])
+        storage = self.config.get("storage", "json")
+        json_options = {"indent": self.config.get("json_indent", 4), "codec": self.config.get("json_codec", "auto")}
+        if storage == "journal":
+            self.storage = JournalStorage(self.config["data_file"], **json_options)
+        elif storage == "sqlite":
+            self.storage = SqliteStorage(self.config["data_file"])
+        elif storage == "json":
+            self.storage = JsonStorage(self.config["data_file"], **json_options)
+        else:
+            raise ValueError(f"Unsupported storage: {storage}")
+        self.tag_translation = TagTranslation(self.config.get("tag_translation_file", "./data/tag_translation.json"))
+
+        if "response_cache" in self.config:
+            response_cache.configure(**{"enabled": True, **self.config["response_cache"]})
+        if "browser_pool" in self.config:
+            browser_pool.configure(**self.config["browser_pool"])
+        if "image_dir" in self.config:
+            image_store.configure(self.config["image_dir"])
+        if "image_workers" in self.config:
+            image_processor.configure(self.config["image_workers"])
+        if "html_parser" in self.config:
+            default_scraper_options["parser"] = self.config["html_parser"]
 
     def has(self, title: str) -> bool:
         """
@@ -40,10 +96,47 @@ class GameList:
         Returns:
             bool: True if a Game with the title exists, False otherwise.
         """
-        return any(title.lower() in game.title.lower() for game in self.games)
+        return bool(self._titles.search(title, fields=(0,)))
+
+    def search(self, text: str, include_corrected: bool = True) -> List[Game]:
+        """
+        Find all Games whose title (or corrected title) contains the given text, case-insensitive.
+
+        Parameters:
+            text (str): The text to search for.
+            include_corrected (bool): Whether to match against the corrected title as well.
+
+        Returns:
+            List[Game]: The matching Games, in list order.
+        """
+        handles = self._titles.search(text, fields=None if include_corrected else (0,))
+        return [self._by_handle[handle] for handle in sorted(handles, key=self._order.__getitem__)]
     
     def get_by_id(self, id:str) -> Optional[Game]:
-        return next((game for game in self.games if game.id == id), None)
+        """
+        Retrieve a Game by its id.
+
+        Parameters:
+            id (str): The id to search for.
+
+        Returns:
+            Optional[Game]: The matching Game, or None if not found.
+        """
+        return self._by_id.get(id)
+
+    def get_by_key(self, title: str, developer: str = "", source: str = "") -> Optional[Game]:
+        """
+        Retrieve a Game by its exact (case-insensitive) title, developer and source.
+
+        Parameters:
+            title (str): The title of the game.
+            developer (str): The developer of the game.
+            source (str): The name of the scraper the game comes from.
+
+        Returns:
+            Optional[Game]: The matching Game, or None if not found.
+        """
+        return self._by_key.get(game_key(title, developer, source))
         
     def get_by_title(self, title: str, criteria: Optional[Dict[str,Any]] = None) -> Optional[Game]:
         """
@@ -57,12 +150,11 @@ class GameList:
             Optional[Game]: The matching Game, or None if not found.
         """
         unique_default = object() # to distinguish between missing attributes and attributes with None values. This ensures that if an attribute is missing, the comparison will fail, and the Game will be skipped.
-        for game in self.games:
-            if title.lower() in game.title.lower():
-                if not criteria:
-                    return game
-                if all(getattr(game, key, unique_default) == value for key, value in criteria.items()):
-                    return game
+        for game in self.search(title, include_corrected=False):
+            if not criteria:
+                return game
+            if all(getattr(game, key, unique_default) == value for key, value in criteria.items()):
+                return game
         return None
 
     def get_by_url(self, url: str) -> Optional[Game]:
@@ -75,10 +167,7 @@ class GameList:
         Returns:
             Optional[Game]: The matching Game, or None if not found.
         """
-        for game in self.games:
-            if url == game.url:
-                return game
-        return None
+        return self._by_url.get(canonical_url(url))
 
     def add(self, game: Game) -> None:
         """
@@ -94,6 +183,7 @@ class GameList:
             print(f"'{game.title}' by {game.developer} is already in Gamelist")
         else:
             self.games.append(game)
+            self._index(game)
 
     def update_or_create(self, game: Game) -> Optional[Game]:
         """
@@ -105,16 +195,138 @@ class GameList:
         Returns:
             Game: The updated or newly added game.
         """
-        if game.developer:
-            existing_game = self.get_by_title(game.title, {"developer":game.developer, "source":game.source})
-        else:
-            existing_game = self.get_by_title(game.title, {"source":game.source})
+        if self._by_id.get(game.id) is game:
+            # The game is already part of the list (e.g. updated in place), only its keys may have changed
+            self._index(game)
+            return game
+
+        existing_game = self.get_by_key(game.title, game.developer, game.source)
+        if not existing_game:
+            if game.developer:
+                existing_game = self.get_by_title(game.title, {"developer":game.developer, "source":game.source})
+            else:
+                existing_game = self.get_by_title(game.title, {"source":game.source})
         if not existing_game:
             print(f"Game with title '{game.title}' by {game.developer or 'unknown'} not found. Adding it.")
             self.games.append(game)
+            self._index(game)
             return game
         existing_game.from_dict(game.to_dict())
+        self._index(existing_game)
         return existing_game
+
+    def reindex(self) -> None:
+        """
+        Rebuild all lookup indexes from self.games.
+        Call this after modifying self.games or the games' title, developer, source, url or id directly.
+
+        Returns:
+            None
+        """
+        self._by_id = {}
+        self._by_url = {}
+        self._by_key = {}
+        self._indexed_keys = {}
+        self._by_tag = {}
+        self._by_handle = {}
+        self._order = {}
+        self._titles.clear()
+        for game in self.games:
+            self._index(game)
+
+    def _index(self, game: Game) -> None:
+        """
+        Add a game to the lookup indexes, replacing any stale entries from a previous indexing.
+        If several games share a key, the first one indexed wins (like the former linear scans).
+        """
+        self._unindex(game)
+        url = canonical_url(game.url)
+        key = game_key(game.title, game.developer, game.source)
+        self._by_id.setdefault(game.id, game)
+        if url:
+            self._by_url.setdefault(url, game)
+        self._by_key.setdefault(key, game)
+        tags = tuple({tag.lower() for tag in game.tags})
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(id(game))
+        self._indexed_keys[id(game)] = (game.id, url, key, tags)
+        self._by_handle[id(game)] = game
+        self._order.setdefault(id(game), len(self._order))
+        self._titles.add(id(game), (game.title, game.corrected_title))
+
+    def _unindex(self, game: Game) -> None:
+        """
+        Remove a game from the lookup indexes.
+        """
+        keys = self._indexed_keys.pop(id(game), None)
+        if not keys:
+            return
+        self._titles.remove(id(game))
+        self._by_handle.pop(id(game), None)
+        game_id, url, key, tags = keys
+        for index, value in ((self._by_id, game_id), (self._by_url, url), (self._by_key, key)):
+            if index.get(value) is game:
+                del index[value]
+        for tag in tags:
+            handles = self._by_tag.get(tag)
+            if handles is not None:
+                handles.discard(id(game))
+                if not handles:
+                    del self._by_tag[tag]
+
+    def get_by_tag(self, tag: str) -> List[Game]:
+        """
+        Retrieve all Games having the given (scraped) tag.
+
+        Parameters:
+            tag (str): The tag to search for, case-insensitive.
+
+        Returns:
+            List[Game]: The matching Games, in list order.
+        """
+        handles = self._by_tag.get(tag.lower(), ())
+        return [self._by_handle[handle] for handle in sorted(handles, key=self._order.__getitem__)]
+
+    def retag(self, previous: Optional[Dict[str, List[str]]] = None) -> List[Game]:
+        """
+        Apply changes of the tag translation file to 'my_tags' of the whole list.
+        Only games having a source tag whose translation changed are recomputed. For those, the
+        tags translated by the previous table but not by the current one are removed, and the
+        currently translated tags are added; other 'my_tags' are kept.
+
+        Parameters:
+            previous (Optional[Dict[str, List[str]]]): The translation table the games were tagged with.
+                Defaults to the table the saved games were tagged with (see save), or the one of the last retag.
+
+        Returns:
+            List[Game]: The games whose 'my_tags' changed.
+        """
+        if previous is None:
+            previous = self.tag_translation.applied
+        self.tag_translation.refresh(force=True)
+        current = self.tag_translation.translation
+
+        changed_tags = [
+            tag for tag in set(previous) | set(current)
+            if set(filter(None, previous.get(tag, []))) != set(filter(None, current.get(tag, [])))
+        ]
+        handles = set().union(*(self._by_tag.get(tag, ()) for tag in changed_tags))
+
+        retagged = []
+        for handle in sorted(handles, key=self._order.__getitem__):
+            game = self._by_handle[handle]
+            source_tags = {tag.lower() for tag in game.tags}
+            old_derived = {t for tag in source_tags for t in previous.get(tag, []) if t}
+            new_derived = {t for tag in source_tags for t in current.get(tag, []) if t}
+            my_tags = tuple(sorted((set(game.my_tags) - (old_derived - new_derived)) | new_derived))
+            if my_tags != game.my_tags:
+                game.my_tags = my_tags
+                retagged.append(game)
+
+        self.tag_translation.mark_applied()
+        if changed_tags:
+            print(f"{len(changed_tags)} changed tag translations, {len(retagged)} games retagged")
+        return retagged
         
     def add_game_from_url(self, url: str, properties: Optional[Dict[str, Any]] = None, **kwargs) -> Game:
         """
@@ -134,22 +346,61 @@ class GameList:
         overwrite = False if properties else True  # If properties are given, don't overwrite them
         game = Game(url=url)
         
-        game.update(repository=self.repository, immediate_update=True, overwrite=overwrite, **kwargs)
+        game.update(repository=self.repository, immediate_update=True, overwrite=overwrite, tag_translation=self.tag_translation, **kwargs)
+        self.tag_translation.flush()
         
         self.update_or_create(game)
         return game
 
-    def load(self) -> None:
+    def load(self, where: Optional[Dict[str, Any]] = None, tags: Optional[List[str]] = None) -> None:
         """
-        Load the games from the JSON storage.
+        Load the games from the storage.
+
+        Parameters:
+            where (Optional[Dict[str, Any]]): Only load games with these values, e.g. {"watch": True}. Requires the sqlite storage.
+            tags (Optional[List[str]]): Only load games having all these tags. Requires the sqlite storage.
 
         Returns:
             None
         """
-        self.games = self.storage.load(Game)
+        # Leave description, versions and cover_img in the storage (or compressed) until they are used
+        lazy_fields = Game.lazy_fields if self.config.get("lazy_load") else ()
+        if isinstance(self.storage, SqliteStorage):
+            self.games = self.storage.load(Game, where=where, tags=tags, lazy_fields=lazy_fields)
+        elif where or tags:
+            raise ValueError("Loading a subset of the games requires the sqlite storage")
+        elif self.config.get("stream_load"):
+            # Lower peak memory on big lists: the games are built while the file is parsed
+            self.games = list(self.storage.iter_load(Game, lazy_fields, self.config.get("lazy_compress", True)))
+        else:
+            self.games = self.storage.load(Game, lazy_fields, self.config.get("lazy_compress", True))
+        self._partial = bool(where or tags)
+        self.reindex()
         print(f"Loaded {len(self.games)} games")
-        self.apply_patches()
-        print(f"Patches applied")
+        if self.tag_translation.load_applied(str(self._tag_state_file())):
+            # Catch up with edits of the tag translation file made since the last save
+            self.retag()
+        self.migrate_cover_images()
+        patched = self.apply_patches()
+        print("Patches unchanged since the last save, skipped" if patched is None else f"Patches applied to {patched} games")
+
+    def migrate_cover_images(self) -> int:
+        """
+        Move covers still stored as base64 data URLs into the image store, keeping only the reference.
+
+        Returns:
+            int: The number of migrated covers.
+        """
+        migrated = 0
+        for game in self.games:
+            if game.cover_img and game.cover_img.startswith("data:"):
+                ref = image_store.put_data_url(game.cover_img)
+                if ref:
+                    game.cover_img = ref
+                    migrated += 1
+        if migrated:
+            print(f"Moved {migrated} covers to {image_store.directory}")
+        return migrated
 
     def save(self) -> None:
         """
@@ -159,16 +410,34 @@ class GameList:
             None
         """
         self.storage.save( self.to_dict() )
+        self.save_patch_state()
+        if not self._partial:
+            self.tag_translation.save_applied(str(self._tag_state_file()))
+        self.tag_translation.flush()
+        response_cache.flush()
         print(f"Saved {len(self.games)} games")
 
+    def close(self) -> None:
+        """
+        Release the resources kept alive between updates (HTTP sessions, browsers, image workers), e.g. at the end of a run.
+
+        Returns:
+            None
+        """
+        session_pool.close()
+        browser_pool.close()
+        image_processor.close()
+        response_cache.flush()
+
     def to_dict(self) -> List[Dict[str, Any]]:
         """
         Convert the list of games to a list of dictionaries.
+        Nested values (versions, validators, ...) are shared with the games, so the result must only be read.
 
         Returns:
             List[Dict[str, Any]]: The list of game dictionaries.
         """
-        gamelist = [game.to_dict() for game in self.games]
+        gamelist = [game.to_dict(copy=False) for game in self.games]
         return sorted(gamelist, key=lambda x: x['title'])
 
     def create_index(self, base_dir: str = "./") -> None:
@@ -183,25 +452,57 @@ class GameList:
             None
         """
         print(f"Creating html index in {base_dir}")
-        env = Environment(loader=FileSystemLoader('./assets/'))
-        template = env.get_template('gameindex.template.html')
+        if self._index_generator is None:
+            self._index_generator = IndexGenerator(cache_dir=self.config.get("index_cache_dir", "./data/index_cache"))
         data = {
             'title': "Index",
             'heading': "GameList Index",
-            'games': self.to_dict()
         }
+        games = self.to_dict()
+
+        if self._screenshot_manifest is None:
+            self._screenshot_manifest = ScreenshotManifest(
+                self.config.get("screenshot_manifest", "./data/screenshot_manifest.json"),
+                self.config.get("scan_workers", 8),
+            )
+        folders = [os.path.join( self.config["archive_root"], game["archive_folder"] or game["title"], "Screenshots" ) for game in games]
+        files = self._screenshot_manifest.get_image_files(folders)
+
+        if self._thumbnail_cache is None:
+            self._thumbnail_cache = ThumbnailCache(
+                self.config.get("thumbnail_dir", "./data/thumbnails"),
+                self.config.get("thumbnail_width", 320),
+            )
+        # Thumbnails of edited, replaced or deleted screenshots are deleted, unless only some games are loaded
+        thumbnails = self._thumbnail_cache.get_thumbnails((item for folder_files in files.values() for item in folder_files), prune=not self._partial)
+
+        sheets: List[str] = []
+        sprites: Dict[str, Tuple[int, int]] = {}
+        if "cover_sheets" in self.config:
+            if self._cover_sprites is None:
+                self._cover_sprites = CoverSprites(**self.config["cover_sheets"])
+            # One sheet per page of the default (alphabetical) view
+            key, reverse = IndexGenerator.orders["alphabetical"]
+            ordered = sorted(games, key=lambda game: key({"title": game["corrected_title"] or game["title"]}), reverse=reverse)
+            names, sprites = self._cover_sprites.pack([game["cover_img"] for game in ordered])
+            sheets = [self._cover_sprites.url(name, base_dir) for name in names]
+
+        for game, folder in zip(games, folders):
+            game["sprite"] = sprites.get(game["cover_img"])
+            game["cover_img"] = image_store.url(game["cover_img"], base_dir)
+            game["images"] = [file_url(path) for path, _ in files[folder]]
+            # The page shows the thumbnails and loads an original only when it is clicked
+            game["thumbnails"] = [
+                self._thumbnail_cache.url(thumbnails[path], base_dir) if thumbnails[path] else file_url(path)
+                for path, _ in files[folder]
+            ]
 
-        for game in data["games"]:
-            game["images"] = get_image_filenames( os.path.join( self.config["archive_root"], game["archive_folder"] or game["title"], "Screenshots" ) )
-
-        html_content = template.render(data)
         file_name = "gameindex.html"
         path = os.path.join(base_dir,file_name)
 
         try:
-            with open(path, "w", encoding='utf-8') as file:
-                file.write(html_content)
-            print(f"Index created successfully at {path}")
+            changed = self._index_generator.generate(path, data, games, sheets, self._cover_sprites.cell if sheets else None)
+            print(f"Index created successfully at {path} ({len(games)} games, data {'updated' if changed else 'unchanged'})")
         except IOError as e:
             print(f"Error writing file {path}: {e}")
         
@@ -211,82 +512,267 @@ class GameList:
         # shutil.copy("gameindex.css", base_dir)
         # shutil.copy("gameindex.js", base_dir)
 
-    def check_for_updates(self, immediate_update=False) -> List[Game]:
+    def check_for_updates(self, immediate_update=False, max_workers: Optional[int] = None, max_workers_per_domain: Optional[int] = None) -> List[Game]:
         """
         Check all games for updates and optionally update them.
+        The pages are fetched by up to max_workers threads, the updates are applied on the calling thread.
 
         Parameters:
             immediate_update (bool): Whether to update games immediately if updates are found.
-            **kwargs: Additional parameters for checking updates.
+            max_workers (Optional[int]): Number of concurrent fetches. Defaults to config "max_workers" or 1.
+            max_workers_per_domain (Optional[int]): Number of concurrent fetches per domain. Defaults to config "max_workers_per_domain" or max_workers.
 
         Returns:
             List[Game]: A list of games that were updated.
         """
         updates = []
-        for game in self.games:
+        fetch = lambda game: game.check_for_updates(repository=self.repository)
+        for game, result, error in self._fetch_all(self.games, fetch, max_workers, max_workers_per_domain):
             print(f"  Checking '{game.title}' by {game.developer}                                                                           ", end='\r')
+            if error:
+                print(f"    Update of {game.title} failed. Error: {error}")
+                continue
+            data, validators = result
+            if validators:
+                # No update: remember the page, so the next check can skip it if unchanged
+                game.validators = validators
             try:
-                data = game.check_for_updates(repository=self.repository)
                 if data and immediate_update:
                     updates.append(game)
                     print(f"    Updating '{game.title}' by {game.developer}")
                     game.update(
                         repository=self.repository,
-                        data=data
+                        data=data,
+                        tag_translation=self.tag_translation
                     )
                     self.update_or_create(game)
             except Exception as e:
                 print(f"    Update of {game.title} failed. Error: {e}")
+        self.tag_translation.flush()
         print()
-        return updates
+        order = {id(game): position for position, game in enumerate(self.games)}
+        return sorted(updates, key=lambda game: order.get(id(game), len(order)))
 
-    def update_all(self) -> None:
+    def update_all(self, max_workers: Optional[int] = None, max_workers_per_domain: Optional[int] = None) -> None:
         """
         Update all games.
+        The pages are fetched by up to max_workers threads, the updates are applied on the calling thread.
 
         Parameters:
+            max_workers (Optional[int]): Number of concurrent fetches. Defaults to config "max_workers" or 1.
+            max_workers_per_domain (Optional[int]): Number of concurrent fetches per domain. Defaults to config "max_workers_per_domain" or max_workers.
 
         Returns:
+            None
         """
-        updates = []
-        for game in self.games:
+        fetch = lambda game: game.get_data(repository=self.repository) if game.url_is_valid else None
+        for game, data, error in self._fetch_all(self.games, fetch, max_workers, max_workers_per_domain):
             print(f"    Updating '{game.title}' by {game.developer}")
+            if error or not data:
+                print(f"    Update of {game.title} failed. Error: {error or 'no data'}")
+                continue
             try:
-                game.update(repository=self.repository)
+                game.update(repository=self.repository, data=data, tag_translation=self.tag_translation)
                 self.update_or_create(game)
             except Exception as e:
                 print(f"    Update of {game.title} failed. Error: {e}")
+        self.tag_translation.flush()
         print()
 
-    def apply_patches(self, patch_file: Optional[str] = None):
+    def _fetch_all(
+        self,
+        games: List[Game],
+        fetch: Callable[[Game], Any],
+        max_workers: Optional[int] = None,
+        max_workers_per_domain: Optional[int] = None
+    ) -> Iterator[Tuple[Game, Any, Optional[Exception]]]:
+        """
+        Run fetch(game) for all games on a bounded thread pool and yield the results as they complete.
+        At most max_workers fetches run at once, and at most max_workers_per_domain for the same domain.
+        The results are yielded on the calling thread, so they can be merged into the list without locking.
+
+        Parameters:
+            games (List[Game]): The games to fetch.
+            fetch (Callable[[Game], Any]): The function doing the (network bound) work for a game.
+            max_workers (Optional[int]): Number of concurrent fetches. Defaults to config "max_workers" or 1.
+            max_workers_per_domain (Optional[int]): Number of concurrent fetches per domain. Defaults to config "max_workers_per_domain" or max_workers.
+
+        Returns:
+            Iterator[Tuple[Game, Any, Optional[Exception]]]: The game, the fetch result and the exception raised, if any.
+        """
+        max_workers = max(1, max_workers or self.config.get("max_workers", 1))
+        max_workers_per_domain = max(1, max_workers_per_domain or self.config.get("max_workers_per_domain", max_workers))
+
+        if max_workers == 1:
+            for game in list(games):
+                try:
+                    yield game, fetch(game), None
+                except Exception as e:
+                    yield game, None, e
+            return
+
+        # One queue per domain, so a slow domain doesn't occupy all workers
+        queues: Dict[str, deque] = {}
+        for game in games:
+            queues.setdefault(url_domain(game.url), deque()).append(game)
+        running: Dict[str, int] = {domain: 0 for domain in queues}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: Dict[Future, Tuple[Game, str]] = {}
+
+            def submit_ready():
+                for domain, queue in queues.items():
+                    while queue and running[domain] < max_workers_per_domain and len(pending) < max_workers:
+                        game = queue.popleft()
+                        running[domain] += 1
+                        pending[executor.submit(fetch, game)] = (game, domain)
+
+            submit_ready()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    game, domain = pending.pop(future)
+                    running[domain] -= 1
+                    error = future.exception()
+                    yield game, None if error else future.result(), error
+                submit_ready()
+
+    def apply_patches(self, patch_file: Optional[str] = None, force: bool = False) -> Optional[int]:
+        """
+        Apply the manual corrections of the patch file to the games.
+        The patches are skipped if the patch file and the storage are unchanged since a save
+        after which all patches still held (see save_patch_state).
+
+        Parameters:
+            patch_file (Optional[str]): The patch file, by default the "patch_file" of config.json.
+            force (bool): Apply the patches even if they are unchanged.
+
+        Returns:
+            Optional[int]: The number of patched games, None if the patches were skipped.
+        """
         filename = patch_file or self.config["patch_file"]
-        with open(filename, 'r', encoding='utf-8') as file:
-            patches = json.load(file)
-        for patch in patches:
-            if patch["id"]:
-                game = self.get_by_id(patch["id"])
-                if game:
-                    if hasattr(game, patch["key"]):  # Ensure the attribute exists
-                        setattr(game, patch["key"], patch["value"])
+        content = Path(filename).read_bytes()
+        self._patches = compile_patches(json.loads(content))
+        self._patch_hash = hashlib.sha256(content).hexdigest()
+        if not force and not self._partial and self._read_patch_state() == self._patch_state():
+            return None
+
+        patched = 0
+        for game_id, changes in self._patches.items():
+            game = self._by_id.get(game_id)
+            if game is None:
+                continue
+            for key, value in changes.items():
+                setattr(game, key, value)
+            self._index(game)
+            patched += 1
+        return patched
+
+    def save_patch_state(self) -> None:
+        """
+        Remember that the storage contains the patched games, so the next load can skip the patches.
+        Nothing is remembered if some patch doesn't hold anymore (e.g. an update overwrote it) or only a subset
+        of the games was loaded, so the patches are applied again on the next load.
+        """
+        if self._patches is None:
+            return
+        holds = not self._partial
+        for game_id, changes in self._patches.items():
+            if not holds:
+                break
+            game = self._by_id.get(game_id)
+            if game is not None:
+                holds = all(patch_holds(game, key, value) for key, value in changes.items())
+        state_file = self._patch_state_file()
+        if not holds:
+            if state_file.exists():
+                os.remove(state_file)
+            return
+        write_atomic(state_file, json.dumps(self._patch_state(), indent=4))
+
+    def _patch_state_file(self) -> Path:
+        data_file = Path(self.config["data_file"])
+        return data_file.with_name(data_file.name + ".patches")
+
+    def _tag_state_file(self) -> Path:
+        # The tag translations the saved games are tagged with, see retag
+        data_file = Path(self.config["data_file"])
+        return data_file.with_name(data_file.name + ".tags")
+
+    def _patch_state(self) -> Dict[str, Any]:
+        # The storage is fingerprinted, so restored or externally edited data gets patched again.
+        # SQLite rewrites its files when it checkpoints the WAL (e.g. on close), so there the
+        # generation counter written by its saves is used instead.
+        if isinstance(self.storage, SqliteStorage):
+            return {"patch_hash": self._patch_hash, "generation": self.storage.generation}
+        data_file = Path(self.config["data_file"])
+        files = {}
+        for path in (data_file, data_file.with_name(data_file.name + ".journal")):
+            if path.exists():
+                stat = path.stat()
+                files[path.name] = [stat.st_mtime_ns, stat.st_size]
+        return {"patch_hash": self._patch_hash, "files": files}
+
+    def _read_patch_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._patch_state_file(), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+
+def compile_patches(patches: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Compile a list of patches into the changes per game id, in one pass.
+    Later patches of the same field win, as if they were applied one after the other.
+    Patches without id or of fields a Game doesn't have are dropped.
+
+    Parameters:
+        patches (List[Dict[str, Any]]): The patches, each with "id", "key" (or "name") and "value".
+
+    Returns:
+        Dict[str, Dict[str, Any]]: game id -> field -> value.
+    """
+    compiled: Dict[str, Dict[str, Any]] = {}
+    for patch in patches:
+        key = patch.get("key", patch.get("name"))
+        if patch.get("id") and key in Game.__dataclass_fields__:
+            compiled.setdefault(patch["id"], {})[key] = patch["value"]
+    return compiled
+
+
+def patch_holds(game: Game, key: str, value: Any) -> bool:
+    """
+    Check whether a patched field still has its patched value.
+    """
+    current = getattr(game, key)
+    if isinstance(current, tuple) and isinstance(value, list):
+        current = list(current)
+    return current == value
+
+
+def game_key(title: str, developer: str = "", source: str = "") -> Tuple[str, str, str]:
+    """
+    Build the normalized (title, developer, source) key used to identify a game across scrapes.
+    """
+    return (normalize_text(title), normalize_text(developer), source or "")
+
+
+def url_domain(url: str) -> str:
+    """
+    Return the lowercased host of a URL, used to limit concurrent requests per site.
+    """
+    return urllib.parse.urlsplit(url or "").netloc.lower()
 
 
 def get_image_filenames(game_dir, image_extensions=['.jpg', '.jpeg', '.png', '.gif', '.bmp']):
-    image_files = []
-    if not Path(game_dir).is_dir():
-        #print(f"No files found for {game_dir}")
-        return []
-
-    for dirpath, _, filenames in os.walk(game_dir):
-        for file in filenames:
-            if any(file.lower().endswith(ext) for ext in image_extensions):
-                full_path = os.path.join(dirpath, file)
-                image_files.append(full_path)
-    
+    """
+    Return the file URLs of the images in a folder and its subfolders, oldest first, without caching.
+    create_index uses the cached ScreenshotManifest instead.
+    """
+    dirs, files = {}, []
+    ScreenshotManifest.scan(game_dir, dirs, files, tuple(ext.lower() for ext in image_extensions))
     # Sort files by modification date (oldest first)
     # Creation date is not reliable on Windows !!
-    image_files.sort(key=lambda x: os.path.getmtime(x))
-
-    # FIXME this is ugly  ???
-    image_files = [ "file:///" + i.replace('\\', '/').replace(' ', '%20').replace("'","%27") for i in image_files ]
-
-    return image_files
\ No newline at end of file
+    files.sort(key=lambda item: item[1])
+    return [file_url(path) for path, _ in files]
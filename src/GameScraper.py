@@ -1,16 +1,23 @@
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from PIL import Image
 from io import BytesIO
 import base64
+import hashlib
 import re
 import time
 import json
 from dateutil.parser import parse as parse_date
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Dict, List, Tuple, Iterator, Any, Optional, Callable
 
 from src.Utility import dict_merge, slugify
+from src.SessionPool import session_pool
+from src.ResponseCache import response_cache
+from src.BrowserPool import browser_pool, PooledBrowser
+from src.ImageStore import image_store, is_image_url
+from src.ImageProcessor import image_processor
 
 import requests
 import cloudscraper
@@ -21,8 +28,20 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 import undetected_chromedriver as uc
 
+try:
+    import lxml
+except ImportError:  # optional, much faster than html.parser
+    lxml = None
+
 # Default options for the scraper
-default_scraper_options = {}
+default_scraper_options = {
+    "conditional": False,  # send the game's stored validators with get_text and skip unchanged pages
+    "parser": "auto",  # HTML parser of make_soup: "lxml", "html.parser", or "auto" (see make_soup)
+    "partial_parse": True,  # let make_soup build only the elements listed in the scraper's parse_only
+}
+
+# Background threads fetching covers while the pages are parsed
+cover_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cover")
 
 class GameScraper(ABC):
     """
@@ -35,6 +54,9 @@ class GameScraper(ABC):
     domain: str = ""
     suffix: str = ""
     paths: str = ""
+    # The elements get_data looks at. Only these tags (with everything inside them) are built by make_soup,
+    # in document order, so searching for them finds the same elements as in the full page.
+    parse_only: Optional[SoupStrainer] = None
 
     def __init__(self, game_instance : 'Game', cookiefile: Optional[str] = None, headerfile: Optional[str] = None, **kwargs):
         """
@@ -52,6 +74,15 @@ class GameScraper(ABC):
         self.headers: Dict[str, str] = {}
         self.game_instance = game_instance
         self.scraper_options: Dict[str, Any] = dict_merge(default_scraper_options, **kwargs)
+        self.validators: Dict[str, str] = {}  # validators of the last page fetched with get_text
+        self.not_modified: bool = False  # True if the last conditional get_text found the page unchanged
+
+    @property
+    def session_key(self) -> str:
+        """
+        The key under which this scraper's HTTP sessions are pooled, e.g. "f95zone.to".
+        """
+        return ".".join(part for part in (self.subdomain, self.domain, self.suffix) if part) or self.name
 
     def load_cookies(self) -> Dict[str, str]:
         """
@@ -121,127 +152,324 @@ class GameScraper(ABC):
         if not self.headers:
             self.load_headers()
 
+        self.not_modified = False
+
+        cached = response_cache.get(url, method, scraper=self.name)
+        if cached:
+            body, final_url, response_headers = cached
+            return self.check_modified(url, body.decode("utf-8"), response_headers), final_url
+        if response_cache.offline:
+            print(f"Offline mode: {url} is not in the response cache")
+            return "", url
+
         if method == "request":
             try:
-                response = requests.get(url, cookies=self.cookies, headers=self.headers)
+                with session_pool.session(self.session_key, method) as session:
+                    response = session.get(url, cookies=self.cookies, headers={**self.headers, **self.conditional_headers(url)})
+                if response.status_code == 304:
+                    self.not_modified = True
+                    return "", url
                 response.raise_for_status()
-                return response.text, url
+                response_cache.put(url, method, response.text.encode("utf-8"), url, response.headers)
+                return self.check_modified(url, response.text, response.headers), url
             except Exception as e:
                 print(f"Error fetching with requests: {e}")
 
         elif method == "cloudscraper":
             try:
-                scraper = cloudscraper.create_scraper(browser='chrome', delay=10)
-                response = scraper.get(url, cookies=self.cookies, headers=self.headers)
+                with session_pool.session(self.session_key, method) as scraper:
+                    response = scraper.get(url, cookies=self.cookies, headers={**self.headers, **self.conditional_headers(url)})
 
                 #with open("response_debug.html", "w", encoding="utf-8") as file:
                 #    file.write(response.text)
 
+                if response.status_code == 304:
+                    self.not_modified = True
+                    return "", url
                 response.raise_for_status()
+                response_cache.put(url, method, response.text.encode("utf-8"), response.url, response.headers)
                 
-                return response.text, response.url
+                return self.check_modified(url, response.text, response.headers), response.url
             except Exception as e:
                 print(f"Error fetching with cloudscraper: {e}")
 
         elif method == "undetectable chromedriver":
             #try:
-                options = uc.ChromeOptions() if method == "undetectable chromedriver" else Options()
-                for arg in arguments:
-                    options.add_argument(arg)
-                options.binary_location = "./bin/chrome-win64/chrome.exe" 
-                driver = uc.Chrome(options=options) if method == "undetectable chromedriver" else webdriver.Chrome(options=options)
-                # Apply the headers
-                for header, value in self.headers.items():
-                    driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {header: value}} )
-                driver.get(url)
-                # Load the Cookies
-                for name, value in self.cookies.items():  # Iterate over name-value pairs
-                    driver.add_cookie({'name': name, 'value': value})
-                driver.get(url)
-                title = driver.title
-                if waitfunction:
-                    waitfunction(driver,title)
-                text = driver.page_source
-                final_url = driver.current_url
-                driver.quit()
-                return text, final_url
+                with browser_pool.browser(arguments) as browser:
+                    self.load_in_browser(browser, url, waitfunction)
+                    text = browser.driver.page_source
+                    final_url = browser.driver.current_url
+                response_cache.put(url, method, text.encode("utf-8"), final_url)
+                return self.check_modified(url, text), final_url
             #except Exception as e:
                 print(f"Error fetching with {method}: {e}")
 
         return "", url
 
-    def get_image(self, src: str, width: Optional[int] = None, method: str = "request", arguments: List[str] = [], waitfunction: Optional[Callable] = None) -> Optional[str]:
+    def load_in_browser(self, browser: PooledBrowser, url: str, waitfunction: Optional[Callable] = None) -> None:
+        """
+        Load a URL in a pooled browser, injecting this scraper's headers and cookies only if the browser doesn't have them yet.
+
+        Parameters:
+            browser (PooledBrowser): The browser checked out from the pool.
+            url (str): The URL to load.
+            waitfunction (Optional[Callable]): Function for custom waiting logic (e.g., clicks).
+        """
+        driver = browser.driver
+        if browser.header_domain != self.session_key:
+            # Apply the headers
+            driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": dict(self.headers)})
+            browser.header_domain = self.session_key
+        if self.session_key not in browser.prepared:
+            driver.get(url)
+            # Load the Cookies
+            for name, value in self.cookies.items():  # Iterate over name-value pairs
+                driver.add_cookie({'name': name, 'value': value})
+            browser.prepared.add(self.session_key)
+        driver.get(url)
+        title = driver.title
+        if waitfunction:
+            waitfunction(driver,title)
+
+    def make_soup(self, text: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """
+        Parse an HTML page with the configured parser, building only the elements the scraper needs.
+        The "auto" parser is lxml for whole pages, if it is installed. Partial parses use html.parser:
+        Beautiful Soup hands every lxml parser event to Python anyway, so lxml gains nothing there,
+        while html.parser skips most of the work for the elements it doesn't build.
+
+        Parameters:
+            text (str): The HTML page.
+            parse_only (Optional[SoupStrainer]): The elements to build. Defaults to the scraper's parse_only; None builds the whole page.
+
+        Returns:
+            BeautifulSoup: The parsed page.
+        """
+        if not self.scraper_options.get("partial_parse", True):
+            parse_only = None
+        elif parse_only is None:
+            parse_only = self.parse_only
+        parser = self.scraper_options.get("parser", "auto")
+        if parser == "auto":
+            parser = "lxml" if lxml and parse_only is None else "html.parser"
+        elif parser == "lxml" and lxml is None:
+            print("HTML parser lxml is not installed, falling back to html.parser")
+            parser = "html.parser"
+        return BeautifulSoup(text, parser, parse_only=parse_only)
+
+    def stored_validators(self, url: str) -> Dict[str, str]:
+        """
+        Return the validators stored with the game for the given URL, if conditional fetching is enabled.
+
+        Parameters:
+            url (str): The URL about to be fetched.
+
+        Returns:
+            Dict[str, str]: The stored validators (etag, last_modified, content_hash), or an empty dict.
+        """
+        if not self.scraper_options.get("conditional") or not self.game_instance:
+            return {}
+        validators = getattr(self.game_instance, "validators", None) or {}
+        if validators.get("url") != url:
+            return {}
+        return validators
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build the If-None-Match / If-Modified-Since headers for the given URL from the stored validators.
+
+        Parameters:
+            url (str): The URL about to be fetched.
+
+        Returns:
+            Dict[str, str]: The conditional request headers, empty if there are no validators.
         """
-        Fetch an image from the given src, optionally resize it, and return it as a Data URL.
+        validators = self.stored_validators(url)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def check_modified(self, url: str, text: str, response_headers: Optional[Dict[str, str]] = None) -> str:
+        """
+        Record the validators of a fetched page and compare its content hash with the stored one.
+
+        Parameters:
+            url (str): The URL that was fetched.
+            text (str): The page content.
+            response_headers (Optional[Dict[str, str]]): The response headers, if any.
+
+        Returns:
+            str: The text, or an empty string if the page is unchanged (self.not_modified is set).
+        """
+        response_headers = response_headers or {}
+        self.validators = {
+            "url": url,
+            "etag": response_headers.get("ETag", ""),
+            "last_modified": response_headers.get("Last-Modified", ""),
+            "content_hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        }
+        stored_hash = self.stored_validators(url).get("content_hash")
+        if stored_hash and stored_hash == self.validators["content_hash"]:
+            self.not_modified = True
+            return ""
+        return text
+
+    def fetch_image(
+        self,
+        src: str,
+        method: str = "request",
+        arguments: List[str] = [],
+        waitfunction: Optional[Callable] = None,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """
+        Fetch the raw bytes of an image.
 
         Parameters:
             src (str): The image's src attribute.
-            width (Optional[int]): Standard width to resize the image. If None, no resizing is performed.
             method (str): Method to use for fetching the image: "request", "cloudscraper", "chromedriver", or "undetectable chromedriver".
             arguments (List[str]): Arguments for the chromedriver options if used.
+            waitfunction (Optional[Callable]): Function for custom waiting logic (e.g., clicks).
+            extra_headers (Optional[Dict[str, str]]): Additional request headers, e.g. for conditional requests.
 
         Returns:
-            Optional[str]: The Data URL of the image, or None if an error occurs.
+            Optional[bytes]: The image bytes, or None if the server answered 304 Not Modified.
+            Dict[str, str]: The ETag and Last-Modified response headers, if any.
         """
         # Ensure cookies and headers are loaded
         if not self.cookies:
             self.load_cookies()
         if not self.headers:
             self.load_headers()
-        
-        try:
-            # Fetch the image using the specified method
-            if method == "request":
-                response = requests.get(src, cookies=self.cookies, headers=self.headers)
-                response.raise_for_status()
-                content = response.content
-            elif method == "cloudscraper":
-                scraper = cloudscraper.create_scraper()
-                response = scraper.get(src, cookies=self.cookies, headers=self.headers)
-                response.raise_for_status()
-                content = response.content
-            elif method == "undetectable chromedriver":
-                options = uc.ChromeOptions()
-                for arg in arguments:
-                    options.add_argument(arg)
-                options.binary_location = "./bin/chrome-win64/chrome.exe" 
-                driver = uc.Chrome(options=options)
-                # Apply the headers
-                for header, value in self.headers.items():
-                    driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {header: value}} )
-                driver.get(src)
-                # Load the Cookies
-                for name, value in self.cookies.items():  # Iterate over name-value pairs
-                    driver.add_cookie({'name': name, 'value': value})
-                driver.get(src)
-                title = driver.title
-                if waitfunction:
-                    waitfunction(driver,title)
-                content = driver.get_screenshot_as_png()
-                driver.quit()
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-
-            # Open the image with Pillow
-            img = Image.open(BytesIO(content))
-
-            # Resize the image if width is specified
-            if width:
-                aspect_ratio = img.height / img.width
-                new_height = int(width * aspect_ratio)
-                img = img.resize((width, new_height), Image.Resampling.LANCZOS)
-
-            # Convert the image to a Data URL
-            buffer = BytesIO()
-            img_format = img.format or "PNG"
-            img.save(buffer, format=img_format)
-            data_url = f"data:image/{img_format.lower()};base64," + base64.b64encode(buffer.getvalue()).decode("utf-8")
-            return data_url
 
+        cached = response_cache.get(src, method, scraper=self.name)
+        if cached:
+            return cached[0], cached[2]
+        if response_cache.offline:
+            raise ValueError(f"Offline mode: image {src} is not in the response cache")
+
+        response_headers: Dict[str, str] = {}
+        if method in session_pool.methods:
+            with session_pool.session(self.session_key, method) as session:
+                response = session.get(src, cookies=self.cookies, headers={**self.headers, **(extra_headers or {})})
+            if response.status_code == 304:
+                return None, {}
+            response.raise_for_status()
+            content = response.content
+            response_headers = {name: response.headers[name] for name in ("ETag", "Last-Modified") if response.headers.get(name)}
+        elif method == "undetectable chromedriver":
+            with browser_pool.browser(arguments) as browser:
+                self.load_in_browser(browser, src, waitfunction)
+                content = browser.driver.get_screenshot_as_png()
+        else:
+            raise ValueError(f"Unsupported method: {method}")
+        response_cache.put(src, method, content, src, response_headers)
+        return content, response_headers
+
+    def get_image(self, src: str, width: Optional[int] = None, method: str = "request", arguments: List[str] = [], waitfunction: Optional[Callable] = None) -> Optional[str]:
+        """
+        Fetch an image from the given src, optionally resize it, and store it in the image store.
+
+        Parameters:
+            src (str): The image's src attribute.
+            width (Optional[int]): Standard width to resize the image. If None, no resizing is performed.
+            method (str): Method to use for fetching the image: "request", "cloudscraper", "chromedriver", or "undetectable chromedriver".
+            arguments (List[str]): Arguments for the chromedriver options if used.
+
+        Returns:
+            Optional[str]: The image store reference of the image, or None if an error occurs.
+        """
+        try:
+            content, _ = self.fetch_image(src, method=method, arguments=arguments, waitfunction=waitfunction)
+            return image_processor.process(content, width)
         except Exception as e:
             print(f"Error fetching or processing image from url {src}: {e}")
             return None
 
+    def get_cover(self, src: str, width: Optional[int] = None, method: str = "request", arguments: List[str] = [], waitfunction: Optional[Callable] = None) -> Future:
+        """
+        Fetch the game's cover in the background, so parsing the page is not blocked on image I/O.
+        The cover is not downloaded (or not resized) again if the source URL and validators are unchanged.
+        Assign the returned future to data["cover_img"]; collect_covers() replaces it with the result.
+
+        Parameters:
+            src (str): The image's src attribute.
+            width (Optional[int]): Standard width to resize the image. If None, no resizing is performed.
+            method (str): Method to use for fetching the image: "request", "cloudscraper", "chromedriver", or "undetectable chromedriver".
+            arguments (List[str]): Arguments for the chromedriver options if used.
+            waitfunction (Optional[Callable]): Function for custom waiting logic (e.g., clicks).
+
+        Returns:
+            Future: Resolves to the cover fields to update ("cover_img", "cover_source"), empty if the cover is unchanged or failed.
+        """
+        return cover_executor.submit(self._get_cover, src, width, method, arguments, waitfunction)
+
+    def _get_cover(self, src: str, width: Optional[int], method: str, arguments: List[str], waitfunction: Optional[Callable]) -> Dict[str, Any]:
+        try:
+            stored = getattr(self.game_instance, "cover_source", None) or {}
+            cover_img = getattr(self.game_instance, "cover_img", "")
+            unchanged_src = (
+                cover_img and not is_image_url(cover_img) and image_store.path(cover_img).exists()
+                and stored.get("url") == src and stored.get("width") == width
+            )
+            conditional_headers = {}
+            if unchanged_src:
+                if stored.get("etag"):
+                    conditional_headers["If-None-Match"] = stored["etag"]
+                if stored.get("last_modified"):
+                    conditional_headers["If-Modified-Since"] = stored["last_modified"]
+                if not conditional_headers:
+                    # Same image URL and no way to validate it, keep the stored cover
+                    return {}
+
+            content, response_headers = self.fetch_image(src, method=method, arguments=arguments, waitfunction=waitfunction, extra_headers=conditional_headers)
+            if content is None:
+                return {}
+            content_hash = hashlib.sha256(content).hexdigest()
+            source = {
+                "url": src,
+                "width": width,
+                "etag": response_headers.get("ETag", ""),
+                "last_modified": response_headers.get("Last-Modified", ""),
+                "content_hash": content_hash,
+            }
+            if unchanged_src and stored.get("content_hash") == content_hash:
+                return {"cover_source": source}
+            return {"cover_img": image_processor.process(content, width), "cover_source": source}
+        except Exception as e:
+            print(f"Image {src} failed to download. Error: ", e)
+            return {}
+
+    def collect_covers(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wait for a cover requested with get_cover() and merge its result into the data.
+
+        Parameters:
+            data (Dict[str, Any]): The data returned by get_data.
+
+        Returns:
+            Dict[str, Any]: The same data, with "cover_img" resolved or removed.
+        """
+        cover = data.get("cover_img")
+        if isinstance(cover, Future):
+            del data["cover_img"]
+            data.update(cover.result())
+        return data
+
+    def discard_covers(self, data: Dict[str, Any]) -> None:
+        """
+        Cancel a cover requested with get_cover() whose result is not needed, e.g. because there is no update.
+
+        Parameters:
+            data (Dict[str, Any]): The data returned by get_data.
+        """
+        cover = data.pop("cover_img", None)
+        if isinstance(cover, Future):
+            cover.cancel()
+
     @abstractmethod
     def get_data(self, **kwargs) -> Dict[str, Any]:
         """
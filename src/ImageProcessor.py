@@ -0,0 +1,168 @@
+import os
+import threading
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from PIL import Image
+
+from src.ImageStore import image_store
+
+T = TypeVar("T")
+
+
+def resize_image(content: bytes, width: Optional[int] = None) -> Tuple[bytes, str]:
+    """
+    Decode an image, optionally resize it to the given width, and encode it again.
+    JPEGs are decoded at a reduced scale (draft mode) when they are much larger than the target,
+    and large downscales reduce the image by an integer factor before the LANCZOS pass.
+    Runs in the worker processes, so it must stay a picklable module-level function.
+
+    Parameters:
+        content (bytes): The encoded image.
+        width (Optional[int]): Standard width to resize the image. If None, no resizing is performed.
+
+    Returns:
+        Tuple[bytes, str]: The encoded image and its format.
+    """
+    # Open the image with Pillow
+    img = Image.open(BytesIO(content))
+
+    # Resize the image if width is specified
+    if width:
+        aspect_ratio = img.height / img.width
+        new_height = int(width * aspect_ratio)
+        if img.format == "JPEG":
+            # Let the JPEG decoder skip detail we would throw away anyway (scales by 1/2, 1/4 or 1/8)
+            img.draft(img.mode, (width, new_height))
+        img = img.resize((width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    buffer = BytesIO()
+    img_format = img.format or "PNG"
+    img.save(buffer, format=img_format)
+    return buffer.getvalue(), img_format
+
+
+class ImageProcessor:
+    """
+    Runs the CPU bound part of image handling (decode, resize, encode) in a process pool,
+    so covers are processed in parallel with network fetches and page parsing.
+    The results are stored in the image store by the calling process. Other image work
+    (thumbnails, cover sheets) uses the same pool through run() and run_all().
+    """
+
+    def __init__(self, workers: Optional[int] = 2):
+        """
+        Initialize the processor. The process pool is started on first use.
+
+        Parameters:
+            workers (Optional[int]): Number of worker processes. 0 processes images on the calling thread, None uses the CPU count.
+                The default is small, so updating a single game doesn't start a process per CPU.
+        """
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def configure(self, workers: Optional[int]) -> None:
+        """
+        Change the number of worker processes, e.g. from the "image_workers" entry of config.json.
+
+        Parameters:
+            workers (Optional[int]): Number of worker processes. 0 processes images on the calling thread, None uses the CPU count.
+        """
+        self.close()
+        self.workers = workers
+
+    @property
+    def executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers == 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers or os.cpu_count())
+            return self._executor
+
+    def run(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Call a function in the process pool and return its result.
+        If the pool can't be used (no workers configured, it can't start or a worker died), the function runs on the calling thread.
+
+        Parameters:
+            function (Callable[..., T]): A picklable module-level function.
+            *args: The arguments of the function.
+
+        Returns:
+            T: The result of the function; its exceptions are raised.
+        """
+        return self._result(self._submit(function, *args), function, *args)
+
+    def run_all(self, function: Callable[..., T], calls: Iterable[Tuple[Any, ...]]) -> List[Tuple[Optional[T], Optional[Exception]]]:
+        """
+        Call a function for several argument tuples in parallel in the process pool (see run).
+
+        Parameters:
+            function (Callable[..., T]): A picklable module-level function.
+            calls (Iterable[Tuple[Any, ...]]): The arguments of each call.
+
+        Returns:
+            List[Tuple[Optional[T], Optional[Exception]]]: The result or the exception of each call, in input order.
+        """
+        jobs = [(self._submit(function, *args), args) for args in calls]
+        results: List[Tuple[Optional[T], Optional[Exception]]] = []
+        for future, args in jobs:
+            try:
+                results.append((self._result(future, function, *args), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
+    def process(self, content: bytes, width: Optional[int] = None) -> str:
+        """
+        Process an image and store it in the image store.
+
+        Parameters:
+            content (bytes): The encoded image.
+            width (Optional[int]): Standard width to resize the image. If None, no resizing is performed.
+
+        Returns:
+            str: The image store reference of the image.
+        """
+        return image_store.put(*self.run(resize_image, content, width))
+
+    def _submit(self, function: Callable[..., T], *args: Any) -> Future:
+        executor = self.executor
+        if executor is not None:
+            try:
+                return executor.submit(function, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                print(f"Image process pool unavailable, processing on this thread. Error: {e}")
+                self.close()
+        future: Future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _result(self, future: Future, function: Callable[..., T], *args: Any) -> T:
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            # A worker died (or the pool can't start, e.g. in some interactive sessions): fall back to this thread
+            print(f"Image process pool failed, processing on this thread. Error: {e}")
+            self.close()
+            return function(*args)
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared processor used by all scrapers
+image_processor = ImageProcessor()
@@ -0,0 +1,123 @@
+import base64
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from src.Utility import relative_directory, write_atomic
+
+
+class ImageStore:
+    """
+    A content-addressed store for cover images.
+    Images are written once as files named by the SHA-256 hash of their content, so identical
+    covers are stored only once and games keep just the file name (the reference) instead of
+    a base64 data URL.
+    """
+
+    def __init__(self, directory: str = "./data/covers"):
+        """
+        Initialize the store.
+
+        Parameters:
+            directory (str): The directory to store the image files in.
+        """
+        self.directory = Path(directory)
+
+    def configure(self, directory: str) -> None:
+        """
+        Change the directory of the store, e.g. from the "image_dir" entry of config.json.
+
+        Parameters:
+            directory (str): The directory to store the image files in.
+        """
+        self.directory = Path(directory)
+
+    def put(self, content: bytes, img_format: str = "png") -> str:
+        """
+        Store image bytes, unless an identical image is already stored.
+
+        Parameters:
+            content (bytes): The encoded image.
+            img_format (str): The image format, used as file extension (e.g. "jpeg", "png").
+
+        Returns:
+            str: The reference (file name) of the stored image.
+        """
+        ref = f"{hashlib.sha256(content).hexdigest()}.{img_format.lower()}"
+        path = self.path(ref)
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, content)
+        return ref
+
+    def put_data_url(self, data_url: str) -> Optional[str]:
+        """
+        Store the image of a base64 data URL.
+
+        Parameters:
+            data_url (str): A "data:image/<format>;base64,..." URL.
+
+        Returns:
+            Optional[str]: The reference of the stored image, or None if the data URL can't be decoded.
+        """
+        try:
+            header, encoded = data_url.split(",", 1)
+            img_format = header[len("data:image/"):].split(";")[0] or "png"
+            return self.put(base64.b64decode(encoded), img_format)
+        except Exception as e:
+            print(f"Error storing image from data URL: {e}")
+            return None
+
+    def path(self, ref: str) -> Path:
+        """
+        Return the path of a stored image.
+
+        Parameters:
+            ref (str): The reference of the image.
+
+        Returns:
+            Path: The path of the image file.
+        """
+        return self.directory / ref
+
+    def get(self, ref: str) -> Optional[bytes]:
+        """
+        Read a stored image.
+
+        Parameters:
+            ref (str): The reference of the image.
+
+        Returns:
+            Optional[bytes]: The image bytes, or None if the image is not stored.
+        """
+        try:
+            return self.path(ref).read_bytes()
+        except OSError:
+            return None
+
+    def url(self, ref: str, base_dir: str = "./") -> str:
+        """
+        Return a URL for an image reference, relative to the directory of an HTML page.
+        Data URLs and absolute URLs are returned unchanged.
+
+        Parameters:
+            ref (str): The reference of the image (or a legacy data URL).
+            base_dir (str): The directory of the page the URL is used in.
+
+        Returns:
+            str: The URL of the image.
+        """
+        if not ref or is_image_url(ref):
+            return ref
+        return f"{relative_directory(str(self.directory), base_dir)}/{ref}"
+
+
+def is_image_url(value: str) -> bool:
+    """
+    Check whether a cover value is a URL (data, http or file) rather than a reference into the image store.
+    """
+    return value.startswith(("data:", "http://", "https://", "file:"))
+
+
+# Shared store used by all scrapers
+image_store = ImageStore()
@@ -0,0 +1,150 @@
+import os
+import json
+import hashlib
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from src.Utility import write_atomic
+
+
+class IndexGenerator:
+    """
+    Generates the static HTML index: a page without game cards, and a data file with the games,
+    a tag -> games index and the presorted orders. The page's script only builds the cards
+    of the page being shown, so opening and filtering the index stays fast for big libraries.
+    The page is streamed to its file, and compiled templates are kept in a Jinja bytecode cache.
+    """
+
+    # Sort orders offered by the page, each with its key and direction
+    orders = {
+        "alphabetical": (lambda game: (game["title"].casefold(), game["title"]), False),
+        "lastUpdated": (lambda game: game["updated"] or "", True),
+        "newest": (lambda game: game["published"] or "", True),
+        "oldest": (lambda game: game["published"] or "", False),
+    }
+
+    def __init__(self, template_dir: str = "./assets/", cache_dir: str = "./data/index_cache",
+                 page_template: str = "gameindex.template.html"):
+        """
+        Initialize the generator.
+
+        Parameters:
+            template_dir (str): The directory of the templates.
+            cache_dir (str): The directory for the compiled templates.
+            page_template (str): The template of the page.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.page_template = page_template
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            bytecode_cache=FileSystemBytecodeCache(str(self.cache_dir)),
+        )
+
+    def build_data(self, games: List[Dict[str, Any]], sheets: Optional[List[str]] = None,
+                   sprite_size: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """
+        Build the data the page's script works on. Games are referred to by their position in "games".
+
+        Parameters:
+            games (List[Dict[str, Any]]): The game dictionaries, with "images", "thumbnails", "sprite" and a resolved "cover_img".
+            sheets (Optional[List[str]]): The URLs of the cover sheets the "sprite" entries refer to (see CoverSprites).
+            sprite_size (Optional[Tuple[int, int]]): The width and height of a cover in the sheets.
+
+        Returns:
+            Dict[str, Any]: The fields and rows of the games, the tag index, the domains, the sort orders and the cover sheets.
+        """
+        fields = ["title", "url", "cover", "status", "watch", "updated", "published", "last_version", "domain", "tags", "images", "thumbnails", "sprite"]
+        domains: Dict[str, int] = {}
+        tag_index: Dict[str, List[int]] = {}
+        rows, records = [], []
+        for position, game in enumerate(games):
+            domain = urllib.parse.urlsplit(game.get("url") or "").hostname or ""
+            record = {
+                "title": game.get("corrected_title") or game.get("title") or "",
+                "updated": game.get("updated") or "",
+                "published": game.get("published") or "",
+            }
+            records.append(record)
+            tags = list(dict.fromkeys(game.get("tags") or []))
+            for tag in tags:
+                tag_index.setdefault(tag, []).append(position)
+            rows.append([
+                record["title"],
+                game.get("url") or "",
+                game.get("cover_img") or "",
+                game.get("status") or "",
+                1 if game.get("watch") else 0,
+                record["updated"],
+                record["published"],
+                game.get("last_version") or "",
+                domains.setdefault(domain, len(domains)),
+                tags,
+                game.get("images") or [],
+                game.get("thumbnails") or [],
+                game.get("sprite"),  # [sheet, offset] or None
+            ])
+        order = {
+            name: sorted(range(len(records)), key=lambda position: key(records[position]), reverse=reverse)
+            for name, (key, reverse) in self.orders.items()
+        }
+        return {
+            "fields": fields,
+            "games": rows,
+            "domains": list(domains),
+            "tags": dict(sorted(tag_index.items())),
+            "orders": order,
+            "sheets": sheets or [],
+            "sprite_size": sprite_size,
+        }
+
+    def write_data(self, path: str, data: Dict[str, Any]) -> bool:
+        """
+        Write the data file, as a script assigning it to window.GAME_INDEX (pages opened from disk can't fetch JSON).
+        The file is left alone if its content didn't change.
+
+        Parameters:
+            path (str): The path of the data file.
+            data (Dict[str, Any]): The data, see build_data.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        content = ("window.GAME_INDEX = " + json.dumps(data, ensure_ascii=False, separators=(",", ":")) + ";\n").encode("utf-8")
+        try:
+            with open(path, "rb") as file:
+                if hashlib.sha1(file.read()).digest() == hashlib.sha1(content).digest():
+                    return False
+        except FileNotFoundError:
+            pass
+        write_atomic(path, content)
+        return True
+
+    def generate(self, path: str, data: Dict[str, Any], games: List[Dict[str, Any]], sheets: Optional[List[str]] = None,
+                 sprite_size: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Write the data file next to the index, then render the page and stream it to its file,
+        replacing it only once it is complete.
+
+        Parameters:
+            path (str): The path of the index file; the data file is written next to it, as <name>.data.js.
+            data (Dict[str, Any]): The variables of the page template (title, heading, ...).
+            games (List[Dict[str, Any]]): The game dictionaries.
+            sheets (Optional[List[str]]): The URLs of the cover sheets, see build_data.
+            sprite_size (Optional[Tuple[int, int]]): The width and height of a cover in the sheets.
+
+        Returns:
+            bool: True if the data file changed.
+        """
+        data_path = os.path.splitext(path)[0] + ".data.js"
+        changed = self.write_data(data_path, self.build_data(games, sheets, sprite_size))
+        template = self.env.get_template(self.page_template)
+        temp = path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            for chunk in template.generate({**data, "data_file": os.path.basename(data_path), "game_count": len(games)}):
+                file.write(chunk)
+        os.replace(temp, path)
+        return changed
@@ -0,0 +1,149 @@
+import os
+import json
+from typing import Type, TypeVar, List, Dict, Any, Optional, Iterator, Iterable
+
+from src.JsonStorage import JsonStorage
+
+T = TypeVar('T')  # A generic type variable
+
+class JournalStorage(JsonStorage[T]):
+    """
+    A JSON storage that appends changes to a journal instead of rewriting the whole file.
+    The file itself is a compacted snapshot (the same format as JsonStorage); the journal next to
+    it is a JSONL log of upserts and deletes, replayed on load. When the journal grows beyond
+    compact_ratio times the snapshot, it is folded into a new snapshot, written atomically.
+    """
+
+    def __init__(self, filename: str, id_field: str = 'id', compact_ratio: float = 0.5, min_compact_size: int = 64 * 1024,
+                 indent: Optional[int] = 4, codec: str = "auto"):
+        """
+        Initialize the storage.
+
+        Parameters:
+            filename (str): The path of the snapshot file; the journal is stored as <filename>.journal.
+            id_field (str): The field identifying an item.
+            compact_ratio (float): Compact when the journal is larger than this fraction of the snapshot.
+            min_compact_size (int): Never compact journals smaller than this many bytes.
+            indent (Optional[int]): Number of spaces to indent the snapshot with, or None for the compact form.
+            codec (str): The JSON library to use, see JsonCodec.
+        """
+        super().__init__(filename, indent, codec)
+        self.journal = self.filename.with_name(self.filename.name + ".journal")
+        self.id_field = id_field
+        self.compact_ratio = compact_ratio
+        self.min_compact_size = min_compact_size
+        self._items: Optional[Dict[str, Dict[str, Any]]] = None  # id -> item, as last loaded or saved
+        self._serialized: Dict[str, str] = {}  # id -> JSON of the item, to detect changes
+
+    def load_dicts(self) -> List[Dict[str, Any]]:
+        """Load the snapshot, replay the journal and return the items as dictionaries."""
+        items: Dict[str, Dict[str, Any]] = {}
+        for item in self.codec.read(self.filename):
+            items[item[self.id_field]] = item
+        if self.journal.exists():
+            with open(self.journal, 'r', encoding='utf-8') as file:
+                for line_number, line in enumerate(file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = self.codec.loads(line)
+                    except ValueError:
+                        # A write interrupted by a crash leaves a partial last line
+                        print(f"Skipping damaged journal entry {line_number} in {self.journal}")
+                        continue
+                    if entry["op"] == "upsert":
+                        items[entry["item"][self.id_field]] = entry["item"]
+                    elif entry["op"] == "delete":
+                        items.pop(entry["id"], None)
+        self._items = items
+        self._serialized = {item_id: self._serialize(item) for item_id, item in items.items()}
+        return list(items.values())
+
+    def load(self, cls: Type[T], lazy_fields: Iterable[str] = (), compress: bool = True) -> List[T]:
+        """Load all instances of type T from the snapshot and the journal, see JsonStorage.load for lazy_fields."""
+        return list(self.iter_load(cls, lazy_fields, compress))
+
+    def iter_load(self, cls: Type[T], lazy_fields: Iterable[str] = (), compress: bool = True) -> Iterator[T]:
+        """Load the instances of type T one by one. The journal has to be replayed first, so this doesn't stream the file."""
+        lazy_fields = tuple(lazy_fields)
+        for item in self.load_dicts():
+            # _items keeps the item for change detection, so hand out a copy
+            yield self._instantiate(cls, dict(item), lazy_fields, compress)
+
+    def save(self, items: List[T]):
+        """Save all instances of type T, appending only the changed and removed ones to the journal."""
+        if self._items is None:
+            self.load_dicts()
+        data = [self._dataclass_to_dict(item) for item in items]
+        current = {item[self.id_field]: item for item in data}
+
+        entries = []
+        for item_id, item in current.items():
+            serialized = self._serialize(item)
+            if self._serialized.get(item_id) != serialized:
+                entries.append({"op": "upsert", "item": item})
+                self._serialized[item_id] = serialized
+        for item_id in [item_id for item_id in self._items if item_id not in current]:
+            entries.append({"op": "delete", "id": item_id})
+            del self._serialized[item_id]
+        self._items = current
+
+        self._append(entries)
+        self.compact_if_needed()
+
+    def add(self, item: T):
+        """Add (or replace) an instance of type T by appending it to the journal."""
+        if self._items is None:
+            self.load_dicts()
+        data = self._dataclass_to_dict(item)
+        self._items[data[self.id_field]] = data
+        self._serialized[data[self.id_field]] = self._serialize(data)
+        self._append([{"op": "upsert", "item": data}])
+        self.compact_if_needed()
+
+    def remove(self, item_id: int, cls: Type[T] = None, id_field: str = 'id'):
+        """Remove an instance of type T by its id, by appending a delete to the journal."""
+        if self._items is None:
+            self.load_dicts()
+        if item_id not in self._items:
+            return
+        del self._items[item_id]
+        self._serialized.pop(item_id, None)
+        self._append([{"op": "delete", "id": item_id}])
+        self.compact_if_needed()
+
+    def compact_if_needed(self) -> bool:
+        """Compact the journal if it outgrew the snapshot. Returns True if it was compacted."""
+        journal_size = self.journal.stat().st_size if self.journal.exists() else 0
+        if journal_size < self.min_compact_size:
+            return False
+        if journal_size <= self.compact_ratio * self.filename.stat().st_size:
+            return False
+        self.compact()
+        return True
+
+    def compact(self):
+        """Write the current items as a new snapshot (atomically) and start an empty journal."""
+        if self._items is None:
+            self.load_dicts()
+        self._write(list(self._items.values()))
+        # The snapshot contains everything in the journal, so a crash before this point loses nothing
+        if self.journal.exists():
+            os.remove(self.journal)
+
+    def _append(self, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        content = b"".join(self.codec.dumps(entry) + b"\n" for entry in entries)
+        if self.journal.exists() and self.journal.stat().st_size:
+            with open(self.journal, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    content = b"\n" + content  # don't glue onto a partial line left by a crash
+        with open(self.journal, 'ab') as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _serialize(self, item: Dict[str, Any]) -> str:
+        return json.dumps(item, sort_keys=True)
@@ -0,0 +1,209 @@
+import codecs
+import gzip
+import json
+from pathlib import Path
+from typing import Any, IO, Iterator, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional, much faster than the json module
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional, used when orjson is not installed
+    msgspec = None
+
+_fast_encode_errors = (TypeError, OverflowError) + ((msgspec.EncodeError,) if msgspec else ())
+
+
+class JsonCodec:
+    """
+    Encodes and decodes JSON with the fastest available library (orjson, then msgspec, then the json module),
+    reads and writes plain or gzip compressed files, and streams the items of a top level JSON array.
+    """
+
+    names = ("auto", "orjson", "msgspec", "json")
+
+    def __init__(self, codec: str = "auto"):
+        """
+        Initialize the codec.
+
+        Parameters:
+            codec (str): One of "auto", "orjson", "msgspec" or "json". "auto" picks the fastest installed library.
+        """
+        if codec not in self.names:
+            raise ValueError(f"Unsupported JSON codec: {codec}. Supported codecs are: {', '.join(self.names)}")
+        if codec == "auto":
+            codec = "orjson" if orjson else "msgspec" if msgspec else "json"
+        elif (codec == "orjson" and orjson is None) or (codec == "msgspec" and msgspec is None):
+            print(f"JSON codec {codec} is not installed, falling back to the json module")
+            codec = "json"
+        self.name = codec
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        """
+        Decode a JSON document.
+
+        Parameters:
+            content (Union[bytes, str]): The JSON document.
+
+        Returns:
+            Any: The decoded value.
+        """
+        if self.name == "orjson":
+            return orjson.loads(content)
+        if self.name == "msgspec":
+            return msgspec.json.decode(content)
+        return json.loads(content)
+
+    def dumps(self, value: Any, indent: Optional[int] = None) -> bytes:
+        """
+        Encode a value as UTF-8 JSON.
+        The fast libraries only indent by 2 spaces, so other indents are written by the json module.
+
+        Parameters:
+            value (Any): The value to encode.
+            indent (Optional[int]): Number of spaces to indent with, or None for the compact form.
+
+        Returns:
+            bytes: The JSON document.
+        """
+        try:
+            if self.name == "orjson" and indent in (None, 2):
+                option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+                return orjson.dumps(value, option=option)
+            if self.name == "msgspec" and indent in (None, 2):
+                content = msgspec.json.encode(value)
+                return msgspec.json.format(content, indent=2) if indent else content
+        except _fast_encode_errors:
+            pass  # e.g. integers beyond 64 bit: let the json module deal with them
+        separators = None if indent is not None else (",", ":")
+        return json.dumps(value, indent=indent, separators=separators, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def is_gzip(filename: Union[str, Path]) -> bool:
+        """Return True if the file is (to be) gzip compressed, by its name or its content."""
+        filename = Path(filename)
+        if filename.suffix == ".gz":
+            return True
+        try:
+            with open(filename, "rb") as file:
+                return file.read(2) == b"\x1f\x8b"
+        except FileNotFoundError:
+            return False
+
+    def open(self, filename: Union[str, Path]) -> IO[bytes]:
+        """Open a (possibly gzip compressed) JSON file for reading, as bytes."""
+        if self.is_gzip(filename):
+            return gzip.open(filename, "rb")
+        return open(filename, "rb")
+
+    def read(self, filename: Union[str, Path]) -> Any:
+        """
+        Read and decode a (possibly gzip compressed) JSON file.
+
+        Parameters:
+            filename (Union[str, Path]): The path of the file.
+
+        Returns:
+            Any: The decoded value.
+        """
+        with self.open(filename) as file:
+            return self.loads(file.read())
+
+    def encode_file(self, filename: Union[str, Path], value: Any, indent: Optional[int] = None) -> bytes:
+        """
+        Encode a value as the content of the given file: JSON, gzip compressed if the file name ends with .gz.
+
+        Parameters:
+            filename (Union[str, Path]): The path of the file.
+            value (Any): The value to encode.
+            indent (Optional[int]): Number of spaces to indent with, or None for the compact form.
+
+        Returns:
+            bytes: The file content.
+        """
+        content = self.dumps(value, indent)
+        if Path(filename).suffix == ".gz":
+            content = gzip.compress(content, compresslevel=6, mtime=0)
+        return content
+
+    def iter_array(self, filename: Union[str, Path], chunk_size: int = 1 << 16) -> Iterator[Any]:
+        """
+        Decode the items of a top level JSON array one by one, reading the file in chunks,
+        so the whole document never has to be in memory at once.
+
+        Parameters:
+            filename (Union[str, Path]): The path of the (possibly gzip compressed) JSON file.
+            chunk_size (int): Number of bytes to read at a time.
+
+        Returns:
+            Iterator[Any]: The items of the array.
+        """
+        decoder = json.JSONDecoder()
+        with self.open(filename) as file:
+            reader = _ChunkReader(file, chunk_size)
+            if reader.next_char() != "[":
+                raise ValueError(f"{filename} does not contain a JSON array")
+            reader.position += 1
+            if reader.next_char() == "]":
+                return
+            while True:
+                reader.next_char()
+                while True:
+                    try:
+                        item, end = decoder.raw_decode(reader.buffer, reader.position)
+                        # A number may continue in the next chunk ("1" of "1.5e3"), it is complete only once
+                        # a ',' or ']' follows. Other values end with a delimiter of their own.
+                        if reader.eof or not isinstance(item, (int, float)) or reader.buffer[end:].lstrip()[:1] in (",", "]"):
+                            break
+                    except json.JSONDecodeError:
+                        if reader.eof:
+                            raise
+                    if reader.eof:
+                        raise ValueError(f"Unexpected end of {filename}")
+                    reader.read_more()
+                reader.position = end
+                yield item
+                separator = reader.next_char()
+                reader.position += 1
+                if separator == "]":
+                    return
+                if separator != ",":
+                    raise ValueError(f"Expected ',' or ']' at offset {reader.offset} of {filename}, found {separator!r}")
+
+
+class _ChunkReader:
+    """A text buffer over a binary file that is refilled on demand and drops what was consumed."""
+
+    def __init__(self, file: IO[bytes], chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.offset = 0  # characters dropped from the start of the buffer
+        self.eof = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()  # keeps characters split between two chunks
+
+    def read_more(self) -> bool:
+        if self.eof:
+            return False
+        # Drop the consumed part, and read bigger chunks for items that don't fit in one
+        self.offset += self.position
+        self.buffer = self.buffer[self.position:]
+        self.position = 0
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer)))
+        self.eof = not chunk
+        self.buffer += self._decoder.decode(chunk, final=self.eof)
+        return not self.eof
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character, or '' at the end of the file."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in " \t\r\n":
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read_more():
+                return ""
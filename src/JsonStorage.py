@@ -1,25 +1,65 @@
-import json
+import inspect
+import zlib
 from dataclasses import asdict, is_dataclass
-from typing import Type, TypeVar, Generic, List, Dict
+from typing import Type, TypeVar, Generic, List, Dict, Iterator, Optional, Any, Iterable
 from pathlib import Path
 
+from src.JsonCodec import JsonCodec
+from src.Utility import write_atomic
+
 T = TypeVar('T')  # A generic type variable
 
+_accepts_copy_cache: Dict[type, bool] = {}
+
+def _accepts_copy(cls: type) -> bool:
+    """Return True if cls.to_dict takes a copy argument (like Game.to_dict)."""
+    accepts = _accepts_copy_cache.get(cls)
+    if accepts is None:
+        try:
+            accepts = "copy" in inspect.signature(cls.to_dict).parameters
+        except (TypeError, ValueError):
+            accepts = False
+        _accepts_copy_cache[cls] = accepts
+    return accepts
+
 class JsonStorage(Generic[T]):
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, indent: Optional[int] = 4, codec: str = "auto"):
+        """
+        Initialize the storage.
+
+        Parameters:
+            filename (str): The path of the JSON file. A name ending with .gz stores it gzip compressed.
+            indent (Optional[int]): Number of spaces to indent the file with, or None for the compact form.
+            codec (str): The JSON library to use, see JsonCodec ("auto" picks orjson or msgspec when installed).
+        """
         self.filename = Path(filename)
+        self.indent = indent
+        self.codec = JsonCodec(codec)
         if not self.filename.exists():
-            self.filename.write_text('[]')  # Initialize file if it doesn't exist
+            self._write([])  # Initialize file if it doesn't exist
+
+    # Serialized size from which a lazy field is kept compressed instead of loaded
+    lazy_min_size = 256
 
-    def load(self, cls: Type[T]) -> List[T]:
-        """Load all instances of type T from the JSON file."""
-        data = json.loads(self.filename.read_text())
-        return [cls(**item) for item in data]
+    def load(self, cls: Type[T], lazy_fields: Iterable[str] = (), compress: bool = True) -> List[T]:
+        """
+        Load all instances of type T from the JSON file.
+        The big values of lazy_fields are kept serialized (and compressed) until they are accessed; cls must provide lazy().
+        """
+        data = self.codec.read(self.filename)
+        lazy_fields = tuple(lazy_fields)
+        return [self._instantiate(cls, item, lazy_fields, compress) for item in data]
+
+    def iter_load(self, cls: Type[T], lazy_fields: Iterable[str] = (), compress: bool = True) -> Iterator[T]:
+        """Load the instances of type T one by one, without reading the whole JSON file into memory."""
+        lazy_fields = tuple(lazy_fields)
+        for item in self.codec.iter_array(self.filename):
+            yield self._instantiate(cls, item, lazy_fields, compress)
 
     def save(self, items: List[T]):
         """Save all instances of type T to the JSON file."""
         data = [self._dataclass_to_dict(item) for item in items]
-        self.filename.write_text(json.dumps(data, indent=4))
+        self._write(data)
 
     def add(self, item: T):
         """Add a new instance of type T to the JSON file."""
@@ -33,11 +73,34 @@ class JsonStorage(Generic[T]):
         items = [item for item in items if getattr(item, id_field) != item_id]
         self.save(items)
 
+    def _instantiate(self, cls: Type[T], item: Dict[str, Any], lazy_fields: Iterable[str], compress: bool) -> T:
+        deferred: Dict[str, bytes] = {}
+        for name in lazy_fields:
+            if name in item:
+                content = self.codec.dumps(item[name])
+                if len(content) >= self.lazy_min_size:
+                    del item[name]
+                    deferred[name] = zlib.compress(content, 1) if compress else content
+        if not deferred:
+            return cls(**item)
+        return cls.lazy(item, self._unpack_compressed if compress else self._unpack, deferred)
+
+    def _unpack(self, name: str, content: bytes) -> Any:
+        return self.codec.loads(content)
+
+    def _unpack_compressed(self, name: str, content: bytes) -> Any:
+        return self.codec.loads(zlib.decompress(content))
+
+    def _write(self, data: List[Dict[str, Any]]):
+        write_atomic(self.filename, self.codec.encode_file(self.filename, data, self.indent))
+
     def _dataclass_to_dict(self, instance: T) -> Dict:
         """Convert a dataclass instance to a dictionary excluding non-dataclass fields."""
         to_dict = getattr(instance, "to_dict", None)
         if to_dict and callable(to_dict):
-            return instance.to_dict()
+            if _accepts_copy(type(instance)):
+                return to_dict(copy=False)  # only serialized, so nested values needn't be copied
+            return to_dict()
         if is_dataclass(instance):
             return asdict(instance)
         if isinstance(instance,dict):
@@ -0,0 +1,225 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from src.Utility import write_atomic
+
+
+class ResponseCache:
+    """
+    An optional on-disk cache for HTTP response bodies, keyed by URL and fetch method.
+    Entries expire after a TTL (configurable per scraper), the total size is capped and the
+    least recently used entries are evicted first. In offline mode cached entries are served
+    regardless of their age and nothing is fetched from the network.
+    """
+
+    def __init__(
+        self,
+        directory: str = "./data/cache",
+        enabled: bool = False,
+        ttl: int = 3600,
+        ttls: Optional[Dict[str, int]] = None,
+        max_size_mb: float = 500,
+        offline: bool = False,
+        flush_every: int = 200
+    ):
+        """
+        Initialize the cache. Nothing is read or written while it is disabled.
+
+        Parameters:
+            directory (str): The directory to store the cached bodies and the index in.
+            enabled (bool): Whether the cache is used at all.
+            ttl (int): Default time to live of an entry in seconds.
+            ttls (Optional[Dict[str, int]]): Time to live per scraper name, overriding the default.
+            max_size_mb (float): Maximum total size of the cached bodies in MB.
+            offline (bool): Serve only from the cache and never hit the network.
+            flush_every (int): Write the index after this many new entries; it is also written by flush().
+        """
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.ttl = ttl
+        self.ttls: Dict[str, int] = ttls or {}
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.offline = offline
+        self.flush_every = flush_every
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._size = 0  # total size of the cached bodies
+        self._unsaved = 0  # entries added since the index was written
+        self._dirty = False
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def configure(self, **options: Any) -> None:
+        """
+        Change the cache options (see __init__), e.g. from the "response_cache" entry of config.json.
+
+        Parameters:
+            **options: The options to change.
+        """
+        with self._lock:
+            if "directory" in options:
+                self.directory = Path(options["directory"])
+                self.entries = {}
+                self._size = 0
+                self._dirty = False
+                self._loaded = False
+            for key in ("enabled", "ttl", "ttls", "offline", "flush_every"):
+                if key in options:
+                    setattr(self, key, options[key])
+            if "max_size_mb" in options:
+                self.max_size = int(options["max_size_mb"] * 1024 * 1024)
+
+    @property
+    def index_file(self) -> Path:
+        return self.directory / "index.json"
+
+    def key(self, url: str, method: str) -> str:
+        """
+        Return the cache key (and file name) for a URL and fetch method.
+        """
+        return hashlib.sha256(f"{method} {url}".encode("utf-8")).hexdigest()
+
+    def get(self, url: str, method: str, scraper: str = "") -> Optional[Tuple[bytes, str, Dict[str, str]]]:
+        """
+        Look up a cached response.
+
+        Parameters:
+            url (str): The requested URL.
+            method (str): The fetch method, e.g. "request" or "cloudscraper".
+            scraper (str): The name of the scraper, to select its TTL.
+
+        Returns:
+            Optional[Tuple[bytes, str, Dict[str, str]]]: The body, the final URL and the response headers, or None if not cached or expired.
+        """
+        if not self.enabled:
+            return None
+        key = self.key(url, method)
+        with self._lock:
+            self._load()
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            ttl = self.ttls.get(scraper, self.ttl)
+            if not self.offline and time.time() - entry["stored"] > ttl:
+                return None
+        # Read outside the lock, so concurrent fetch threads don't wait for each other's disk reads
+        try:
+            body = (self.directory / key).read_bytes()
+        except OSError:
+            with self._lock:
+                if self.entries.get(key) is entry:
+                    self._remove(key)
+            return None
+        with self._lock:
+            entry["accessed"] = time.time()
+            self._dirty = True
+        return body, entry["final_url"], entry["headers"]
+
+    def put(self, url: str, method: str, body: bytes, final_url: str = "", headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Store a response and evict the least recently used entries if the size cap is exceeded.
+
+        Parameters:
+            url (str): The requested URL.
+            method (str): The fetch method, e.g. "request" or "cloudscraper".
+            body (bytes): The response body.
+            final_url (str): The URL after redirections.
+            headers (Optional[Dict[str, str]]): The response headers worth keeping (ETag, Last-Modified).
+        """
+        if not self.enabled or self.offline:
+            return
+        key = self.key(url, method)
+        with self._lock:
+            self._load()
+        # Written outside the lock: write_atomic is safe for concurrent writers of the same file
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.directory / key, body)
+        now = time.time()
+        with self._lock:
+            previous = self.entries.get(key)
+            if previous:
+                self._size -= previous["size"]
+            self.entries[key] = {
+                "url": url,
+                "method": method,
+                "final_url": final_url or url,
+                "headers": {name: headers[name] for name in ("ETag", "Last-Modified") if headers and headers.get(name)},
+                "size": len(body),
+                "stored": now,
+                "accessed": now,
+            }
+            self._size += len(body)
+            self._dirty = True
+            self._unsaved += 1
+            self._evict()
+            if self._unsaved >= self.flush_every:
+                self._save()
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        with self._lock:
+            self._load()
+            for key in list(self.entries):
+                self._remove(key)
+            self._save()
+
+    def flush(self) -> None:
+        """
+        Persist the index, including the access times used for LRU eviction.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._loaded and self._dirty:
+                self._save()
+
+    def _evict(self) -> None:
+        if self._size <= self.max_size:
+            return
+        # Evict down to 90% of the cap, so a full cache doesn't sort its entries on every put
+        target = self.max_size * 0.9
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["accessed"]):
+            if self._size <= target:
+                break
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= entry["size"]
+        self._dirty = True
+        try:
+            os.remove(self.directory / key)
+        except OSError:
+            pass
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            self.entries = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            print(f"Error loading response cache index {self.index_file}: {e}")
+            self.entries = {}
+        self._size = sum(entry["size"] for entry in self.entries.values())
+        self._dirty = False
+
+    def _save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.index_file, json.dumps(self.entries).encode("utf-8"))
+        self._dirty = False
+        self._unsaved = 0
+
+
+# Shared cache used by all scrapers, disabled unless configured
+response_cache = ResponseCache()
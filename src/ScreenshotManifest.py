@@ -0,0 +1,146 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src.Utility import write_atomic
+
+
+class ScreenshotManifest:
+    """
+    A persistent cache of the screenshots in the archive, keyed by folder.
+    A folder is only scanned again if the mtime of one of its directories changed
+    (adding, removing or renaming a file changes the mtime of its directory),
+    and changed folders are scanned concurrently, which matters on network shares.
+    """
+
+    image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+
+    def __init__(self, filename: str = "./data/screenshot_manifest.json", workers: int = 8):
+        """
+        Initialize the manifest. The file is read on first use.
+
+        Parameters:
+            filename (str): The path of the manifest file.
+            workers (int): Number of threads checking and scanning folders.
+        """
+        self.filename = filename
+        self.workers = workers
+        # folder -> {"dirs": {directory: mtime_ns}, "files": [[path, mtime], ...]}, files sorted by mtime
+        self.entries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+        self._changed = False
+
+    def load(self) -> None:
+        """
+        Read the manifest file.
+        """
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                self.entries = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+        self._changed = False
+
+    def save(self) -> None:
+        """
+        Write the manifest file if it changed.
+        """
+        with self._lock:
+            if not self._changed:
+                return
+            write_atomic(self.filename, json.dumps(self.entries, ensure_ascii=False))
+            self._changed = False
+
+    def get_image_files(self, folders: List[str]) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Return the image files of several folders, scanning only the changed ones, and save the manifest.
+
+        Parameters:
+            folders (List[str]): The screenshot folders.
+
+        Returns:
+            Dict[str, List[Tuple[str, float]]]: folder -> paths and mtimes of its images, oldest first.
+        """
+        if self.entries is None:
+            self.load()
+        unique = list(dict.fromkeys(folders))
+        if self.workers > 1 and len(unique) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="screenshots") as executor:
+                files = dict(zip(unique, executor.map(self.get_files, unique)))
+        else:
+            files = {folder: self.get_files(folder) for folder in unique}
+        self.save()
+        return files
+
+    def get_files(self, folder: str) -> List[Tuple[str, float]]:
+        """
+        Return the image files of a folder and its subfolders, from the manifest if the folder didn't change.
+
+        Parameters:
+            folder (str): The screenshot folder.
+
+        Returns:
+            List[Tuple[str, float]]: The paths and mtimes of the images, oldest first.
+        """
+        if self.entries is None:
+            self.load()
+        with self._lock:
+            entry = self.entries.get(folder)
+        if entry is not None and self._unchanged(entry["dirs"]):
+            return entry["files"]
+
+        dirs: Dict[str, int] = {}
+        files: List[Tuple[str, float]] = []
+        self.scan(folder, dirs, files, self.image_extensions)
+        # Sort files by modification date (oldest first)
+        # Creation date is not reliable on Windows !!
+        files.sort(key=lambda item: item[1])
+        with self._lock:
+            if dirs:
+                self.entries[folder] = {"dirs": dirs, "files": files}
+                self._changed = True
+            elif self.entries.pop(folder, None) is not None:  # no such folder (anymore)
+                self._changed = True
+        return files
+
+    @staticmethod
+    def scan(directory: str, dirs: Dict[str, int], files: List[Tuple[str, float]], extensions: Tuple[str, ...]) -> None:
+        """
+        Collect the image files of a directory and its subdirectories, with one stat per file.
+
+        Parameters:
+            directory (str): The directory to scan.
+            dirs (Dict[str, int]): Receives the mtimes of the scanned directories.
+            files (List[Tuple[str, float]]): Receives the paths and mtimes of the images (unsorted).
+            extensions (Tuple[str, ...]): The lowercased image file extensions.
+        """
+        try:
+            dirs[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        ScreenshotManifest.scan(entry.path, dirs, files, extensions)
+                    elif entry.name.lower().endswith(extensions):
+                        files.append((entry.path, entry.stat().st_mtime))
+        except (FileNotFoundError, NotADirectoryError):
+            dirs.pop(directory, None)
+
+    @staticmethod
+    def _unchanged(dirs: Dict[str, int]) -> bool:
+        for directory, mtime in dirs.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+
+def file_url(path: str) -> str:
+    """
+    Turn the path of a screenshot into the file URL used by the index.
+    """
+    # FIXME this is ugly  ???
+    return "file:///" + path.replace('\\', '/').replace(' ', '%20').replace("'", "%27")
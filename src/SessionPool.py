@@ -0,0 +1,95 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+import requests
+import cloudscraper
+
+
+class SessionPool:
+    """
+    A thread-safe pool of persistent HTTP sessions, keyed by scraper domain and fetch method.
+    Sessions keep their connections (and, for cloudscraper, the solved challenge cookies) alive
+    between requests, so pages and images of a domain don't pay a new handshake each time.
+    A session is only used by one thread at a time; concurrent fetches for the same domain get
+    their own session, which is returned to the pool afterwards.
+    """
+
+    methods = ("request", "cloudscraper")
+
+    def __init__(self, pool_maxsize: int = 10):
+        """
+        Initialize an empty pool.
+
+        Parameters:
+            pool_maxsize (int): Number of connections each session keeps alive per host.
+        """
+        self.pool_maxsize = pool_maxsize
+        self._idle: Dict[Tuple[str, str], List[requests.Session]] = {}
+        self._all: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def create_session(self, method: str) -> requests.Session:
+        """
+        Create a new session for the given fetch method.
+
+        Parameters:
+            method (str): "request" or "cloudscraper".
+
+        Returns:
+            requests.Session: The new session.
+        """
+        if method == "request":
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        elif method == "cloudscraper":
+            # cloudscraper mounts its own TLS adapter, which must be kept
+            session = cloudscraper.create_scraper(browser='chrome', delay=10)
+        else:
+            raise ValueError(f"Unsupported method for session pool: {method}")
+        return session
+
+    @contextmanager
+    def session(self, domain: str, method: str = "request") -> Iterator[requests.Session]:
+        """
+        Check out a session for a domain, creating one if none is idle, and return it to the pool afterwards.
+
+        Parameters:
+            domain (str): The scraper domain, e.g. "f95zone.to".
+            method (str): "request" or "cloudscraper".
+
+        Returns:
+            Iterator[requests.Session]: The session, to be used within a with-block.
+        """
+        key = (domain, method)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            session = idle.pop() if idle else None
+        if session is None:
+            session = self.create_session(method)
+            with self._lock:
+                self._all.append(session)
+        try:
+            yield session
+        finally:
+            with self._lock:
+                if session in self._all:
+                    self._idle.setdefault(key, []).append(session)
+
+    def close(self) -> None:
+        """
+        Close all sessions of the pool, e.g. at the end of a run.
+        """
+        with self._lock:
+            sessions, self._all, self._idle = self._all, [], {}
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                print(f"Error closing session: {e}")
+
+
+# Shared pool used by all scrapers
+session_pool = SessionPool()
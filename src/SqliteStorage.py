@@ -0,0 +1,265 @@
+import json
+import sqlite3
+import hashlib
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Type, TypeVar, Generic, List, Dict, Any, Optional, Iterable, Tuple
+
+from src.JsonStorage import JsonStorage
+
+T = TypeVar('T')  # A generic type variable
+
+class SqliteStorage(Generic[T]):
+    """
+    A storage with the interface of JsonStorage, backed by SQLite.
+    Every item is stored as JSON together with indexed columns (and a tag join table),
+    so saves only write changed items and subsets can be loaded or counted without
+    deserializing the whole library.
+    """
+
+    column_types: Dict[str, str] = {
+        "url": "TEXT",
+        "title": "TEXT",
+        "source": "TEXT",
+        "developer": "TEXT",
+        "status": "TEXT",
+        "updated": "TEXT",
+        "watch": "INTEGER",
+    }
+    columns: Tuple[str, ...] = tuple(column_types)
+    # Size from which a lazy field is left in the database on load
+    lazy_min_size = 256
+
+    def __init__(self, filename: str, id_field: str = 'id'):
+        """
+        Initialize the storage and create the database schema if needed.
+
+        Parameters:
+            filename (str): The path of the SQLite database file.
+            id_field (str): The field identifying an item.
+        """
+        self.filename = Path(filename)
+        self.id_field = id_field
+        self._lock = threading.Lock()
+        self._loaded_ids: set = set()  # ids of the last load() or save(), the only ones save() may delete
+        self.connection = sqlite3.connect(str(self.filename), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS items (
+                    id TEXT PRIMARY KEY,
+                    {", ".join(f"{column} {self.column_types[column]}" for column in self.columns)},
+                    hash TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )""")
+            for column in self.columns:
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS items_{column} ON items ({column})")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS tags (
+                    item_id TEXT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (item_id, tag)
+                )""")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def load(self, cls: Type[T], where: Optional[Dict[str, Any]] = None, tags: Optional[Iterable[str]] = None,
+             lazy_fields: Iterable[str] = ()) -> List[T]:
+        """
+        Load instances of type T, optionally only those matching the filters.
+
+        Parameters:
+            cls (Type[T]): The class to instantiate.
+            where (Optional[Dict[str, Any]]): Column values to match, e.g. {"watch": True}. Lists match any of their values.
+            tags (Optional[Iterable[str]]): Tags all loaded items must have.
+            lazy_fields (Iterable[str]): Fields left in the database until they are accessed; cls must provide lazy().
+
+        Returns:
+            List[T]: The loaded instances.
+        """
+        lazy_fields = list(lazy_fields)
+        if not lazy_fields:
+            rows = self._select(["id", "data"], where, tags)
+            self._loaded_ids = {row["id"] for row in rows}
+            return [cls(**json.loads(row["data"])) for row in rows]
+
+        # Let SQLite strip the big values of the lazy fields (removing a missing path does nothing), and note which ones it stripped
+        paths = [self._json_path(name) for name in lazy_fields]
+        big = [f"length(json_extract(data, {path})) >= {self.lazy_min_size}" for path in paths]
+        removed = [f"CASE WHEN {condition} THEN {path} ELSE '$.__kept__' END" for condition, path in zip(big, paths)]
+        columns = ["id", f"json_remove(data, {', '.join(removed)}) AS data"]
+        columns += [f"coalesce({condition}, 0) AS deferred_{index}" for index, condition in enumerate(big)]
+        rows = self._select(columns, where, tags)
+        self._loaded_ids = {row["id"] for row in rows}
+        loader = lambda name, item_id: self.load_field(item_id, name)
+        items = []
+        for row in rows:
+            item_id = row["id"]
+            deferred = {name: item_id for index, name in enumerate(lazy_fields) if row[f"deferred_{index}"]}
+            items.append(cls.lazy(json.loads(row["data"]), loader, deferred))
+        return items
+
+    def load_field(self, item_id: str, name: str) -> Any:
+        """
+        Load a single field of an item.
+
+        Parameters:
+            item_id (str): The id of the item.
+            name (str): The name of the field.
+
+        Returns:
+            Any: The value of the field, None if it isn't set.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT json_extract(data, ?) AS value, json_type(data, ?) AS type FROM items WHERE id = ?",
+                (f"$.{name}", f"$.{name}", item_id)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Item {item_id} is not in {self.filename} anymore, can't load its {name}")
+        if row["type"] in ("object", "array"):
+            return json.loads(row["value"])
+        if row["type"] in ("true", "false"):
+            return bool(row["value"])
+        return row["value"]
+
+    def query(self, where: Optional[Dict[str, Any]] = None, tags: Optional[Iterable[str]] = None, columns: Iterable[str] = ("id", "title")) -> List[Dict[str, Any]]:
+        """
+        Return the indexed columns of the matching items, without deserializing them.
+
+        Parameters:
+            where (Optional[Dict[str, Any]]): Column values to match, e.g. {"source": "F95zone"}.
+            tags (Optional[Iterable[str]]): Tags all matching items must have.
+            columns (Iterable[str]): The columns to return (id and any of SqliteStorage.columns).
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per matching item.
+        """
+        columns = list(columns)
+        for column in columns:
+            self._check_column(column, allow_id=True)
+        return [dict(row) for row in self._select(columns, where, tags)]
+
+    def count(self, where: Optional[Dict[str, Any]] = None, tags: Optional[Iterable[str]] = None) -> int:
+        """
+        Count the matching items.
+
+        Parameters:
+            where (Optional[Dict[str, Any]]): Column values to match.
+            tags (Optional[Iterable[str]]): Tags all matching items must have.
+
+        Returns:
+            int: The number of matching items.
+        """
+        return self._select(["COUNT(*) AS count"], where, tags)[0]["count"]
+
+    def save(self, items: List[T]):
+        """
+        Save instances of type T, writing only new and changed ones.
+        Items loaded from this storage but missing from the list are deleted; items that were
+        never loaded (e.g. because only a subset was loaded) are left alone.
+        """
+        data = [self._dataclass_to_dict(item) for item in items]
+        current_ids = {item[self.id_field] for item in data}
+        with self._lock, self.connection:
+            stored = dict(self.connection.execute("SELECT id, hash FROM items").fetchall())
+            for item in data:
+                self._upsert(item, stored)
+            deleted = [(item_id,) for item_id in self._loaded_ids - current_ids if item_id in stored]
+            self.connection.executemany("DELETE FROM tags WHERE item_id = ?", deleted)
+            self.connection.executemany("DELETE FROM items WHERE id = ?", deleted)
+            self._next_generation()
+        self._loaded_ids = current_ids
+
+    def add(self, item: T):
+        """Add (or replace) an instance of type T."""
+        with self._lock, self.connection:
+            self._upsert(self._dataclass_to_dict(item))
+            self._next_generation()
+
+    def remove(self, item_id: int, cls: Type[T] = None, id_field: str = 'id'):
+        """Remove an instance of type T by its id."""
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM tags WHERE item_id = ?", (item_id,))
+            self.connection.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            self._next_generation()
+        self._loaded_ids.discard(item_id)
+
+    @property
+    def generation(self) -> int:
+        """
+        A counter increased by every save, add and remove, identifying the stored state.
+        Unlike the mtimes of the database files, it doesn't change when SQLite checkpoints its WAL.
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row["value"] if row else 0
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def _next_generation(self):
+        self.connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('generation', 1) ON CONFLICT (key) DO UPDATE SET value = value + 1")
+
+    def _upsert(self, item: Dict[str, Any], stored: Optional[Dict[str, str]] = None):
+        serialized = json.dumps(item, sort_keys=True)
+        item_hash = hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+        item_id = item[self.id_field]
+        if stored is not None and stored.get(item_id) == item_hash:
+            return  # unchanged
+        values = [self._column_value(item.get(column)) for column in self.columns]
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO items (id, {', '.join(self.columns)}, hash, data) VALUES ({', '.join('?' * (len(self.columns) + 3))})",
+            [item_id, *values, item_hash, serialized]
+        )
+        self.connection.execute("DELETE FROM tags WHERE item_id = ?", (item_id,))
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO tags (item_id, tag) VALUES (?, ?)",
+            [(item_id, tag.lower()) for tag in item.get("tags") or []]
+        )
+
+    def _select(self, columns: List[str], where: Optional[Dict[str, Any]], tags: Optional[Iterable[str]]) -> List[sqlite3.Row]:
+        clauses, parameters = [], []
+        for column, value in (where or {}).items():
+            self._check_column(column, allow_id=True)
+            if isinstance(value, (list, tuple, set)):
+                values = [self._column_value(v) for v in value]
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters.extend(values)
+            elif value is None:
+                clauses.append(f"{column} IS NULL")
+            else:
+                clauses.append(f"{column} = ?")
+                parameters.append(self._column_value(value))
+        for tag in tags or []:
+            clauses.append("id IN (SELECT item_id FROM tags WHERE tag = ?)")
+            parameters.append(tag.lower())
+        sql = f"SELECT {', '.join(columns)} FROM items"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    @staticmethod
+    def _json_path(name: str) -> str:
+        if not name.isidentifier():
+            raise ValueError(f"Unsupported field name: {name}")
+        return f"'$.{name}'"
+
+    def _check_column(self, column: str, allow_id: bool = False):
+        if column not in self.columns and not (allow_id and column == "id"):
+            raise ValueError(f"Unsupported column: {column}. Indexed columns are: id, {', '.join(self.columns)}")
+
+    @staticmethod
+    def _column_value(value: Any) -> Any:
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    _dataclass_to_dict = JsonStorage._dataclass_to_dict
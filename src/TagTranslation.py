@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+
+from src.Utility import write_atomic
+
+
+class TagTranslation:
+    """
+    The translation table from scraped tags to 'my_tags', kept in memory.
+    The file is read once and re-read only when it was changed externally (by mtime).
+    New tags are collected in memory and written in one go by flush(), via a temp file and a rename.
+    """
+
+    def __init__(self, filename: str = "./data/tag_translation.json", reload_interval: float = 2.0):
+        """
+        Initialize the table. The file is loaded on first use.
+
+        Parameters:
+            filename (str): The path of the tag translation JSON file.
+            reload_interval (float): Minimum number of seconds between two checks of the file's mtime.
+        """
+        self.filename = filename
+        self.reload_interval = reload_interval
+        self.translation: Dict[str, List[str]] = {}
+        self.new_tags: Dict[str, List[str]] = {}  # found since the last flush
+        self.applied: Dict[str, List[str]] = {}  # the table the whole game list was last tagged with, see GameList.retag
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.filename).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> Dict[str, List[str]]:
+        """
+        (Re)load the table from the file, keeping the new tags not flushed yet.
+
+        Returns:
+            Dict[str, List[str]]: The translation table.
+        """
+        with self._lock:
+            self._mtime = self._file_mtime()
+            self._checked = time.monotonic()
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as file:
+                    translation = json.load(file)
+            except FileNotFoundError:
+                translation = {}
+            for tag, translated in self.new_tags.items():
+                translation.setdefault(tag, translated)
+            self.translation = translation
+            self._loaded = True
+            return self.translation
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the table if the file was changed since it was read.
+
+        Parameters:
+            force (bool): Check the mtime even if the last check is more recent than reload_interval.
+
+        Returns:
+            bool: True if the table was (re)loaded.
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                return True
+            now = time.monotonic()
+            if not force and now - self._checked < self.reload_interval:
+                return False
+            self._checked = now
+            if self._file_mtime() != self._mtime:
+                self.load()
+                return True
+            return False
+
+    def mark_applied(self) -> None:
+        """
+        Remember the current table as the one the whole game list is tagged with.
+        """
+        with self._lock:
+            self.refresh(force=True)
+            self.applied = {tag: list(translated) for tag, translated in self.translation.items()}
+
+    def save_applied(self, filename: str) -> None:
+        """
+        Write the applied table, so the next run knows what the saved games are tagged with.
+
+        Parameters:
+            filename (str): The path of the file, next to the game list data file.
+        """
+        with self._lock:
+            write_atomic(filename, json.dumps(self.applied, ensure_ascii=False, sort_keys=True, indent=4))
+
+    def load_applied(self, filename: str) -> bool:
+        """
+        Read the applied table written by save_applied. Without that file the current table is marked as applied.
+
+        Parameters:
+            filename (str): The path of the file, next to the game list data file.
+
+        Returns:
+            bool: True if the applied table was read from the file.
+        """
+        with self._lock:
+            try:
+                with open(filename, 'r', encoding='utf-8') as file:
+                    self.applied = json.load(file)
+                return True
+            except FileNotFoundError:
+                pass
+            except json.JSONDecodeError as e:
+                print(f"Error loading applied tag translations {filename}: {e}")
+            self.mark_applied()
+            return False
+
+    def get(self, tag: str) -> Optional[List[str]]:
+        """
+        Look up the translation of a (lowercased) tag.
+
+        Parameters:
+            tag (str): The tag to translate.
+
+        Returns:
+            Optional[List[str]]: The translated tags, or None if the tag is not in the table.
+        """
+        with self._lock:
+            self.refresh()
+            return self.translation.get(tag)
+
+    def add(self, tag: str) -> None:
+        """
+        Add a new, untranslated tag. It is written to the file on the next flush().
+
+        Parameters:
+            tag (str): The new tag.
+        """
+        with self._lock:
+            self.refresh()
+            if tag not in self.translation:
+                self.translation[tag] = []
+                self.new_tags[tag] = []
+
+    def flush(self) -> bool:
+        """
+        Write the table to the file if new tags were found, merging external edits made in the meantime.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        with self._lock:
+            if not self.new_tags:
+                return False
+            self.refresh(force=True)
+            # TODO backup before overwriting
+            lines = []
+            for key, value in sorted(self.translation.items(), key=lambda x: x[0]):
+                # Serialize the key and value
+                json_key = json.dumps(key, ensure_ascii=False)
+                json_value = json.dumps(sorted(value), ensure_ascii=False)
+                lines.append(f'    {json_key}: {json_value}')
+            write_atomic(self.filename, '{\n' + ',\n'.join(lines) + '\n}\n')
+            self.new_tags = {}
+            self._mtime = self._file_mtime()
+            return True
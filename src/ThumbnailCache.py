@@ -0,0 +1,113 @@
+import os
+import hashlib
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from src.ImageProcessor import image_processor
+from src.Utility import relative_directory, write_atomic
+
+
+def make_thumbnail(source: str, target: str, width: int) -> None:
+    """
+    Write a downscaled JPEG copy of an image. Called through image_processor.run_all.
+
+    Parameters:
+        source (str): The path of the image.
+        target (str): The path of the thumbnail.
+        width (int): The maximal width of the thumbnail; smaller images keep their size.
+    """
+    with Image.open(source) as img:
+        height = max(1, int(width * img.height / img.width))
+        img.thumbnail((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        buffer = BytesIO()
+        img.save(buffer, format="JPEG", quality=80, optimize=True)
+    write_atomic(target, buffer.getvalue())
+
+
+class ThumbnailCache:
+    """
+    Downscaled copies of the archive screenshots, shown by the index instead of the originals.
+    A thumbnail is named after the path and mtime of its screenshot, so it is built once and
+    again only when the screenshot changes. Missing thumbnails are built in the image process pool,
+    and thumbnails of screenshots that changed or are gone can be deleted afterwards.
+    """
+
+    def __init__(self, directory: str = "./data/thumbnails", width: int = 320):
+        """
+        Initialize the cache.
+
+        Parameters:
+            directory (str): The directory to store the thumbnails in.
+            width (int): The maximal width of the thumbnails.
+        """
+        self.directory = Path(directory)
+        self.width = width
+
+    def name(self, path: str, mtime: float) -> str:
+        """
+        Return the file name of the thumbnail of a screenshot.
+
+        Parameters:
+            path (str): The path of the screenshot.
+            mtime (float): The modification time of the screenshot.
+
+        Returns:
+            str: The file name of the thumbnail.
+        """
+        return f"{hashlib.sha1(f'{path}|{mtime}|{self.width}'.encode('utf-8')).hexdigest()}.jpg"
+
+    def get_thumbnails(self, files: Iterable[Tuple[str, float]], prune: bool = False) -> Dict[str, Optional[str]]:
+        """
+        Return the thumbnails of screenshots, building the missing ones.
+
+        Parameters:
+            files (Iterable[Tuple[str, float]]): The paths and mtimes of the screenshots (see ScreenshotManifest.get_files).
+            prune (bool): Delete the thumbnails of all other screenshots; only if files are all the screenshots of the index.
+
+        Returns:
+            Dict[str, Optional[str]]: screenshot path -> file name of its thumbnail, None if it couldn't be built.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        existing = set(os.listdir(self.directory))
+        thumbnails: Dict[str, Optional[str]] = {}
+        missing: List[Tuple[str, str]] = []
+        for path, mtime in files:
+            name = self.name(path, mtime)
+            thumbnails[path] = name
+            if name not in existing:
+                missing.append((path, name))
+                existing.add(name)
+        if prune:
+            unused = existing.difference(thumbnails.values())
+            for name in unused:
+                if name.endswith(".jpg"):
+                    try:
+                        os.remove(self.directory / name)
+                    except OSError:
+                        pass
+        if missing:
+            print(f"Creating {len(missing)} thumbnails")
+        calls = [(path, str(self.directory / name), self.width) for path, name in missing]
+        for (path, _, _), (_, error) in zip(calls, image_processor.run_all(make_thumbnail, calls)):
+            if error:
+                print(f"Error creating thumbnail of {path}: {error}")
+                thumbnails[path] = None
+        return thumbnails
+
+    def url(self, name: str, base_dir: str = "./") -> str:
+        """
+        Return the URL of a thumbnail, relative to the directory of an HTML page.
+
+        Parameters:
+            name (str): The file name of the thumbnail.
+            base_dir (str): The directory of the page the URL is used in.
+
+        Returns:
+            str: The URL of the thumbnail.
+        """
+        return f"{relative_directory(str(self.directory), base_dir)}/{name}"
@@ -0,0 +1,107 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+class TrigramIndex:
+    """
+    An inverted index from character trigrams to the keys of the texts containing them.
+    Used to answer case-insensitive substring queries by verifying only the candidate
+    postings instead of scanning every text.
+    """
+
+    n: int = 3
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self.postings: Dict[str, Set[Hashable]] = {}
+        self.texts: Dict[Hashable, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def ngrams(self, text: str) -> Set[str]:
+        """
+        Return the set of n-grams of a (lowercased) text.
+
+        Parameters:
+            text (str): The text to split.
+
+        Returns:
+            Set[str]: The n-grams of the text.
+        """
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, key: Hashable, texts: Iterable[str]) -> None:
+        """
+        Index (or re-index) the texts belonging to a key.
+
+        Parameters:
+            key (Hashable): The key the texts belong to.
+            texts (Iterable[str]): The texts to index, e.g. title and corrected title.
+        """
+        self.remove(key)
+        lowered = tuple((text or "").lower() for text in texts)
+        self.texts[key] = lowered
+        for gram in set().union(*(self.ngrams(text) for text in lowered)):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Remove a key and its texts from the index.
+
+        Parameters:
+            key (Hashable): The key to remove.
+        """
+        lowered = self.texts.pop(key, None)
+        if lowered is None:
+            return
+        for gram in set().union(*(self.ngrams(text) for text in lowered)):
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def clear(self) -> None:
+        """
+        Remove all keys from the index.
+        """
+        self.postings = {}
+        self.texts = {}
+
+    def search(self, query: str, fields: Optional[Iterable[int]] = None) -> Set[Hashable]:
+        """
+        Return the keys with a text containing the query (case-insensitive).
+
+        Parameters:
+            query (str): The substring to search for.
+            fields (Optional[Iterable[int]]): Positions of the texts (as passed to add) to match against. All if None.
+
+        Returns:
+            Set[Hashable]: The matching keys.
+        """
+        query = query.lower()
+        grams = self.ngrams(query)
+        if grams:
+            postings: List[Set[Hashable]] = []
+            for gram in grams:
+                keys = self.postings.get(gram)
+                if not keys:
+                    return set()
+                postings.append(keys)
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            # Queries shorter than n can't use the postings, verify every text instead
+            candidates = set(self.texts)
+
+        fields = tuple(fields) if fields is not None else None
+        matches = set()
+        for key in candidates:
+            texts = self.texts[key]
+            if fields is not None:
+                texts = tuple(texts[i] for i in fields if i < len(texts))
+            if any(query in text for text in texts):
+                matches.add(key)
+        return matches
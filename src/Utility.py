@@ -1,5 +1,10 @@
+import os
 import re
-from typing import Dict, Any
+import functools
+import threading
+import urllib.parse
+from pathlib import Path
+from typing import Dict, Any, Union
 
 def dict_diff(base_options: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
     """Return the difference between base_options and kwargs."""
@@ -26,3 +31,51 @@ def dict_merge(base_options: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
 def slugify(text: str) -> str:
     """Convert a string to a URL-friendly slug."""
     return re.sub(r'[-\s]+', '-', re.sub(r'[^\w\s-]', '', text)).strip().lower()
+
+def normalize_text(text: str) -> str:
+    """Normalize a string for case-insensitive lookups (lowercase, collapsed whitespace)."""
+    return " ".join((text or "").split()).lower()
+
+def canonical_url(url: str) -> str:
+    """Return a canonical form of a URL for lookups (lowercase scheme/host, no fragment, no trailing slash)."""
+    if not url:
+        return ""
+    parts = urllib.parse.urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+@functools.lru_cache(maxsize=16)
+def relative_directory(directory: str, base_dir: str) -> str:
+    """
+    Return the path of a directory relative to the directory of an HTML page, for use in URLs.
+    Cached, since a page asks for it once per image.
+
+    Parameters:
+        directory (str): The directory, e.g. of the image store.
+        base_dir (str): The directory of the page.
+
+    Returns:
+        str: The relative path, with forward slashes.
+    """
+    return Path(os.path.relpath(directory, base_dir)).as_posix()
+
+
+def write_atomic(path: Union[str, Path], content: Union[str, bytes], encoding: str = "utf-8") -> None:
+    """Write a file via a temporary file and a rename, so readers (and crashes) never leave a partial file.
+    The temporary file is unique per process and thread, so threads may write the same file at once (the last rename wins)."""
+    path = Path(path)
+    temp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    if isinstance(content, str):
+        content = content.encode(encoding)
+    try:
+        with open(temp, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
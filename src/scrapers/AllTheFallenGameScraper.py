@@ -1,5 +1,5 @@
 import re
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from typing import Dict, Iterator, Optional, Any, List
 from dateutil.parser import parse as parse_date
 from html import unescape
@@ -30,6 +30,7 @@ class AllTheFallenGameScraper(GameScraper):
     domain: str = "allthefallen"
     suffix: str = "moe"
     paths: Optional[List[str]] = None
+    parse_only = SoupStrainer(["title", "h1", "article", "meta", "dl", "time"])
     
     def __init__(self, game_instance: Game, **kwargs):
         super().__init__(game_instance, **kwargs)
@@ -45,7 +46,7 @@ class AllTheFallenGameScraper(GameScraper):
         #with open("page_debug.html", "w", encoding="utf-8") as file:
         #    file.write(text)
 
-        soup = BeautifulSoup(text, "html.parser")
+        soup = self.make_soup(text)
 
         data: Dict[str, Optional[str]] = {
             "url": url,
@@ -66,11 +67,7 @@ class AllTheFallenGameScraper(GameScraper):
             cover = article.find("img")
             if cover:
                 src = cover.get("src")
-                try:
-                    data_url = self.get_image(src, width=300, method="undetectable chromedriver", arguments=arguments, waitfunction=waitfunction)
-                    data["cover_img"] = data_url
-                except Exception as e:
-                    print(f"Image {src} failed to download. Error: ", e)
+                data["cover_img"] = self.get_cover(src, width=300, method="undetectable chromedriver", arguments=arguments, waitfunction=waitfunction)
         
         # Description
         description_tag = soup.find("meta", property="og:description")
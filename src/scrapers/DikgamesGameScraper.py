@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from dateutil.parser import parse as parse_date
 from typing import Dict, Iterator, Optional, Any, List
 
@@ -23,7 +22,7 @@ class DikgamesGameScraper(GameScraper):
 
     def get_data(self, url: str) -> Dict[str, Optional[str]]:
         (text, url) = self.get_text(url)
-        soup = BeautifulSoup(text, "html.parser")
+        soup = self.make_soup(text)
 
         data: Dict[str, Optional[str]] = {
             "url": url,
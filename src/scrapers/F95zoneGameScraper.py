@@ -1,5 +1,5 @@
 import re
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from dateutil.parser import parse as parse_date
 from typing import Dict, Iterator, Optional, Any, List
 from html import unescape
@@ -16,6 +16,7 @@ class F95zoneGameScraper(GameScraper):
     domain: str = "f95zone"
     suffix: str = "to"
     paths: Optional[List[str]] = None
+    parse_only = SoupStrainer(["h1", "article", "time", "link", "meta", "a"])
 
     def __init__(self, game_instance: Game, **kwargs):
         self.cookiefile: str = "./data/cookies/f95_cookies.txt"
@@ -28,7 +29,7 @@ class F95zoneGameScraper(GameScraper):
         if not text:
             return {"url": url, "error": "Failed to fetch data"}
             
-        soup = BeautifulSoup(text, "html.parser")
+        soup = self.make_soup(text)
 
         #with open("page_debug.html", "w", encoding="utf-8") as file:
         #    file.write(text)
@@ -138,11 +139,7 @@ class F95zoneGameScraper(GameScraper):
             if cover:
                 src = cover.get("data-src")
                 #print(f"image src: {src}")
-                try:
-                    data_url = self.get_image(src, width=300)
-                    data["cover_img"] = data_url
-                except Exception as e:
-                    print(f"Image {src} failed to download. Error: ",e)
+                data["cover_img"] = self.get_cover(src, width=300)
 
             headline = soup.find("h1")
             headline_text = str(headline)
@@ -235,7 +232,7 @@ class F95zoneGameScraper(GameScraper):
             return WebDriverWait(driver,30).until(EC.element_to_be_clickable((By.CSS_SELECTOR,".formSubmitRow-controls > button"))).click()
 
         (text, url) = self.get_text(url, method="chromedriver", arguments=["--headless=new"], wait=waitfunction)
-        soup = BeautifulSoup(text, "html.parser")
+        soup = self.make_soup(text, SoupStrainer("h3"))
 
         cleaned_name = name.lower().replace(" ","").replace("'","").replace(".","").replace("&","")
         for search_result in soup.find_all("h3", class_="contentRow-title"):
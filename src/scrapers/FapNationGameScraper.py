@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from dateutil.parser import parse as parse_date
 from typing import Dict, Iterator, Optional, Any, List
 from html import unescape
@@ -16,6 +15,7 @@ class FapNationGameScraper(GameScraper):
     domain: str = "fap-nation"
     suffix: str = "com"
     paths: Optional[List[str]] = None
+    # No parse_only: the tabs are looked up by id among all <div>s, which hold nearly the whole page
     
     def __init__(self, game_instance: Game, **kwargs):
         self.cookiefile: str = "./data/cookies/fapnation_cookies.txt"
@@ -31,7 +31,7 @@ class FapNationGameScraper(GameScraper):
         #with open("page_debug.html", "w", encoding="utf-8") as file:
         #    file.write(text)
 
-        soup = BeautifulSoup(text, "html.parser")
+        soup = self.make_soup(text)
         data: Dict[str, Optional[str]] = {
             "url": url,
             "source": FapNationGameScraper.name
@@ -49,11 +49,7 @@ class FapNationGameScraper(GameScraper):
         image = soup.find("meta", attrs={"property": "og:image"})
         if image:
             src = image.get("content")
-            try:
-                data_url = self.get_image(src, width=300, method="cloudscraper")
-                data["cover_img"] = data_url
-            except Exception as e:
-                print(f"Image {src} failed to download. Error: ", e)
+            data["cover_img"] = self.get_cover(src, width=300, method="cloudscraper")
 
         # Last update
         last_update = soup.find("meta", attrs={"property": "og:updated_time"})
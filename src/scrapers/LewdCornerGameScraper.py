@@ -1,5 +1,5 @@
 import re
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from dateutil.parser import parse as parse_date
 from typing import Dict, Iterator, Optional, Any, List
 from html import unescape
@@ -16,6 +16,7 @@ class LewdCornerGameScraper(GameScraper):
     domain: str = "lewdcorner"
     suffix: str = "com"
     paths: Optional[List[str]] = None
+    parse_only = SoupStrainer(["h1", "article", "meta", "dl", "ol", "span"])
     
     def __init__(self, game_instance: Game, **kwargs):
         self.cookiefile: str = "./data/cookies/lewdcorner_cookies.txt"
@@ -31,7 +32,7 @@ class LewdCornerGameScraper(GameScraper):
         #with open("page_debug.html", "w", encoding="utf-8") as file:
         #    file.write(text)
 
-        soup = BeautifulSoup(text, "html.parser")
+        soup = self.make_soup(text)
         data: Dict[str, Optional[str]] = {
             "url": final_url,
             "source": LewdCornerGameScraper.name
@@ -51,11 +52,7 @@ class LewdCornerGameScraper(GameScraper):
                 cover = article.find("img")
                 if cover:
                     src = cover.get("src")
-                    try:
-                        data_url = self.get_image(src, width=300, method="cloudscraper")
-                        data["cover_img"] = data_url
-                    except Exception as e:
-                        print(f"Image {src} failed to download. Error: ", e)
+                    data["cover_img"] = self.get_cover(src, width=300, method="cloudscraper")
 
             # Description
             description_tag = soup.find("meta", property="og:description")
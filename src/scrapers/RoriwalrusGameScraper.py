@@ -1,5 +1,5 @@
 import re
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from dateutil.parser import parse as parse_date
 from typing import Dict, Iterator, Optional, Any, List
 from html import unescape
@@ -17,6 +17,7 @@ class RoriwalrusGameScraper(GameScraper):
     domain: str = "roriwalrus"
     suffix: str = "com"
     paths: Optional[List[str]] = None
+    parse_only = SoupStrainer(["h1", "article", "time", "meta", "li", "span"])
     
     def __init__(self, game_instance: Game, **kwargs):
         self.cookiefile: str = "./data/cookies/roriwalrus_cookies.txt"
@@ -35,7 +36,7 @@ class RoriwalrusGameScraper(GameScraper):
         #with open("page_debug.html", "w", encoding="utf-8") as file:
         #    file.write(text)
 
-        soup = BeautifulSoup(text, "html.parser")
+        soup = self.make_soup(text)
         data: Dict[str, Optional[str]] = {
             "url": final_url,
             "source": RoriwalrusGameScraper.name
@@ -56,11 +57,7 @@ class RoriwalrusGameScraper(GameScraper):
                 cover = article.find("img")
                 if cover:
                     src = cover.get("src")
-                    try:
-                        data_url = self.get_image(src, width=300, method="cloudscraper")
-                        data["cover_img"] = data_url
-                    except Exception as e:
-                        print(f"Image {src} failed to download. Error: ", e)
+                    data["cover_img"] = self.get_cover(src, width=300, method="cloudscraper")
 
             # Published
             published = soup.find("time")
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from src.GameList import GameList
+from src.ScraperRepository import ScraperRepository
+
+
+@pytest.fixture
+def make_game_list(tmp_path):
+    """
+    Return a factory creating a GameList whose files all live in tmp_path.
+    Keyword arguments are added to (or override) its config.
+    """
+    def make(games=None, **config):
+        config = {
+            "data_file": str(tmp_path / "gamelist.json"),
+            "patch_file": str(tmp_path / "patches.json"),
+            "tag_translation_file": str(tmp_path / "tag_translation.json"),
+            "image_dir": str(tmp_path / "covers"),
+            "archive_root": str(tmp_path / "archive"),
+            **config,
+        }
+        patch_file = tmp_path / "patches.json"
+        if not patch_file.exists():
+            patch_file.write_text("[]", encoding="utf-8")
+        if games is not None:
+            (tmp_path / "gamelist.json").write_text(json.dumps(games), encoding="utf-8")
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps(config), encoding="utf-8")
+        return GameList(ScraperRepository(), config_file=str(config_file))
+    return make
@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from src.BrowserPool import BrowserPool, PooledBrowser
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = BrowserPool(size=1)
+    monkeypatch.setattr(pool, "create_browser", lambda arguments: PooledBrowser(FakeDriver(), arguments))
+    return pool
+
+
+@pytest.mark.parametrize("error", [KeyboardInterrupt, GeneratorExit, ValueError])
+def test_interrupted_browser_frees_its_slot(pool, error):
+    with pytest.raises(error):
+        with pool.browser([]) as browser:
+            raise error()
+    assert browser.driver.quit_called
+    assert pool._count == 0
+
+    # The next checkout doesn't wait for the lost driver
+    done = threading.Event()
+
+    def checkout():
+        with pool.browser([]):
+            done.set()
+    thread = threading.Thread(target=checkout, daemon=True)
+    thread.start()
+    assert done.wait(5)
+
+
+def test_browser_is_reused(pool):
+    with pool.browser([]) as first:
+        pass
+    with pool.browser([]) as second:
+        pass
+    assert first is second and pool._count == 1
@@ -0,0 +1,95 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import src.CoverSprites
+from src.CoverSprites import CoverSprites
+from src.ImageProcessor import image_processor
+from src.ImageStore import image_store
+
+
+@pytest.fixture
+def covers(tmp_path, monkeypatch):
+    """Distinct covers in a temporary image store, and a list of the sheets built."""
+    monkeypatch.setattr(image_store, "directory", tmp_path / "covers")
+    monkeypatch.setattr(image_processor, "workers", 0)
+    built = []
+    build_sheet = src.CoverSprites.build_sheet
+
+    def counting_build_sheet(sources, target, *args):
+        built.append(target)
+        return build_sheet(sources, target, *args)
+
+    monkeypatch.setattr(src.CoverSprites, "build_sheet", counting_build_sheet)
+
+    def make(count):
+        refs = []
+        for index in range(count):
+            buffer = BytesIO()
+            Image.new("RGB", (8, 8), (index, 255 - index, 0)).save(buffer, format="PNG")
+            refs.append(image_store.put(buffer.getvalue(), "png"))
+        return refs
+    return make, built
+
+
+def sheet_files(tmp_path):
+    return sorted(path.name for path in (tmp_path / "sheets").glob("*.webp"))
+
+
+def test_new_cover_only_rebuilds_its_sheet(tmp_path, covers):
+    make, built = covers
+    refs = make(61)
+    sprites = CoverSprites(str(tmp_path / "sheets"), width=40, height=16, per_sheet=20)
+    sheets, placed = sprites.pack(refs[:60])
+    assert len(sheets) == 3 and len(built) == 3
+    assert sprites.sheets_per_page(sprites._load_layout(), refs[:60]) == 1
+
+    # A new game on the second page joins (and splits) the second sheet, the others keep their file
+    built.clear()
+    order = [*refs[:30], refs[60], *refs[30:60]]
+    new_sheets, new_placed = sprites.pack(order)
+    assert len(built) == 2
+    assert new_sheets[0] == sheets[0] and new_sheets[-1] == sheets[2]
+    location = lambda sheets, placed, ref: (sheets[placed[ref][0]], placed[ref][1])
+    assert all(location(new_sheets, new_placed, ref) == location(sheets, placed, ref) for ref in refs[:20] + refs[40:60])
+    assert sprites.sheets_per_page(sprites._load_layout(), order) <= 2
+    assert sheet_files(tmp_path) == sorted(new_sheets)
+
+
+def test_changed_order_packs_the_pages_again(tmp_path, covers):
+    make, built = covers
+    refs = make(60)
+    sprites = CoverSprites(str(tmp_path / "sheets"), width=40, height=16, per_sheet=20)
+    sprites.pack(refs)
+
+    # Every page of the new order needs all three sheets
+    built.clear()
+    order = [ref for start in range(3) for ref in refs[start::3]]
+    sheets, placed = sprites.pack(order)
+    assert len(built) == 3
+    assert sprites.sheets_per_page(sprites._load_layout(), order) == 1
+    assert [placed[ref] for ref in order[:2]] == [(0, 0), (0, 16)]
+    assert sheet_files(tmp_path) == sorted(sheets)
+
+
+def test_unused_sheets_are_deleted(tmp_path, covers):
+    make, built = covers
+    refs = make(60)
+    sprites = CoverSprites(str(tmp_path / "sheets"), width=40, height=16, per_sheet=20)
+    sheets, _ = sprites.pack(refs)
+
+    # Removing a few covers leaves holes, removing all covers of a sheet deletes it
+    built.clear()
+    new_sheets, placed = sprites.pack(refs[25:])
+    assert built == []
+    assert new_sheets == sheets[1:]
+    assert placed[refs[25]] == (0, 5 * 16)
+    assert sheet_files(tmp_path) == sorted(new_sheets)
+
+    # A sheet that lost most of its covers is built again without the holes
+    new_sheets, placed = sprites.pack(refs[35:])
+    assert len(built) == 1
+    assert new_sheets[1] == sheets[2]
+    assert placed[refs[35]] == (0, 0)
+    assert sheet_files(tmp_path) == sorted(new_sheets)
@@ -0,0 +1,16 @@
+import sys
+
+from src.Game import Game
+
+
+def test_class_attributes_of_wrapped_fields_are_descriptors():
+    # Not the dataclass default (dataclasses.MISSING for versions)
+    assert Game.versions is Game.__dict__["versions"]
+    assert hasattr(Game.tags, "__get__") and hasattr(Game.developer, "__set__")
+
+
+def test_wrapped_fields_intern_and_default():
+    game = Game(title="Game", developer="".join(["De", "v"]), tags=["rpg", "adventure", "rpg"])
+    assert game.versions == {} and game.my_tags == ()
+    assert game.tags == ("adventure", "rpg")
+    assert game.developer is sys.intern("Dev")
@@ -0,0 +1,99 @@
+import json
+
+from src.Game import Game
+from src.ImageStore import image_store
+
+
+def test_load_keeps_missing_cover(make_game_list):
+    # Scrapers used to store None when a cover couldn't be fetched
+    game_list = make_game_list([{"id": "1", "title": "No cover", "url": "https://example.com/1", "cover_img": None}])
+    game_list.load()
+    assert len(game_list.games) == 1
+    assert not game_list.games[0].cover_img
+
+
+def test_load_moves_data_url_covers_to_the_image_store(make_game_list):
+    data_url = "data:image/png;base64,iVBORw0KGgo="
+    game_list = make_game_list([{"id": "1", "title": "Inline cover", "url": "https://example.com/1", "cover_img": data_url}])
+    game_list.load()
+    ref = game_list.games[0].cover_img
+    assert ref.endswith(".png")
+    assert image_store.path(ref).read_bytes() == b"\x89PNG\r\n\x1a\n"
+
+
+def test_load_retags_after_the_translation_file_changed(make_game_list, tmp_path):
+    translation_file = tmp_path / "tag_translation.json"
+    translation_file.write_text(json.dumps({"sandbox": ["Open world"]}), encoding="utf-8")
+    game = {"id": "1", "title": "Tagged", "url": "https://example.com/1", "tags": ["Sandbox"], "my_tags": ["Open world", "Mine"]}
+    game_list = make_game_list([game])
+    game_list.load()
+    game_list.save()
+
+    # Edited while the program wasn't running
+    translation_file.write_text(json.dumps({"sandbox": ["Free roam"]}), encoding="utf-8")
+    game_list = make_game_list()
+    game_list.load()
+    assert game_list.games[0].my_tags == ("Free roam", "Mine")
+
+
+def test_patches_matching_no_game_are_reported_as_applied(make_game_list, capsys):
+    game_list = make_game_list([{"id": "1", "title": "Game", "url": "https://example.com/1"}])
+    game_list.load()
+    assert "Patches applied to 0 games" in capsys.readouterr().out
+
+
+def test_sqlite_patches_are_skipped_after_a_save(make_game_list, tmp_path, capsys):
+    (tmp_path / "patches.json").write_text(json.dumps([{"id": "1", "key": "title", "value": "Patched"}]), encoding="utf-8")
+    game_list = make_game_list(storage="sqlite", data_file=str(tmp_path / "games.db"))
+    game_list.load()
+    game_list.update_or_create(Game(id="1", title="Game", url="https://example.com/1"))
+    game_list.apply_patches()
+    game_list.save()
+    # Closing checkpoints the WAL into the database file
+    game_list.storage.close()
+    capsys.readouterr()
+
+    game_list = make_game_list(storage="sqlite", data_file=str(tmp_path / "games.db"))
+    game_list.load()
+    assert "Patches unchanged since the last save, skipped" in capsys.readouterr().out
+    assert game_list.games[0].title == "Patched"
+    game_list.storage.close()
+
+
+class UnchangedPageScraper:
+    """A scraper finding no update, with new validators for the page."""
+    def __init__(self, game, **kwargs):
+        self.game = game
+        self.validators = {"ETag": '"v2"'}
+        self.not_modified = False
+
+    def get_data(self, url):
+        return {"updated": self.game.updated}
+
+    def discard_covers(self, data):
+        pass
+
+
+def test_check_for_updates_stores_validators_on_the_calling_thread(make_game_list, monkeypatch):
+    monkeypatch.setattr(Game, "get_scraper", lambda self, repository, name="": UnchangedPageScraper)
+    game_list = make_game_list([{"id": "1", "title": "Game", "url": "https://example.com/1", "updated": "2024-01-01"}])
+    game_list.load()
+    game = game_list.games[0]
+
+    # The check itself leaves the game alone, it runs on the fetch threads
+    assert game.check_for_updates(repository=game_list.repository) == (None, {"ETag": '"v2"'})
+    assert not game.validators
+
+    assert game_list.check_for_updates(max_workers=2) == []
+    assert game.validators == {"ETag": '"v2"'}
+
+
+def test_load_is_quiet_when_the_translations_are_unchanged(make_game_list, tmp_path, capsys):
+    (tmp_path / "tag_translation.json").write_text(json.dumps({"sandbox": ["Open world"]}), encoding="utf-8")
+    game_list = make_game_list([{"id": "1", "title": "Tagged", "url": "https://example.com/1", "tags": ["Sandbox"]}])
+    game_list.load()
+    game_list.save()
+    capsys.readouterr()
+
+    make_game_list().load()
+    assert "tag translations" not in capsys.readouterr().out
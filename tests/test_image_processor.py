@@ -0,0 +1,30 @@
+import pytest
+
+from src.ImageProcessor import ImageProcessor
+
+
+def halve(value):
+    if value < 0:
+        raise ValueError("negative")
+    return value / 2
+
+
+class ShutDownExecutor:
+    def submit(self, *args):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+
+def test_run_all_returns_results_and_errors_in_order():
+    processor = ImageProcessor(workers=0)
+    results = processor.run_all(halve, [(4,), (-1,), (3,)])
+    assert [result for result, _ in results] == [2, None, 1.5]
+    assert isinstance(results[1][1], ValueError)
+    with pytest.raises(ValueError):
+        processor.run(halve, -1)
+
+
+def test_run_falls_back_to_this_thread_without_a_pool(monkeypatch):
+    processor = ImageProcessor(workers=1)
+    processor._executor = ShutDownExecutor()
+    monkeypatch.setattr(processor, "close", lambda: None)
+    assert processor.run(halve, 8) == 4
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from src.JsonCodec import JsonCodec
+
+VALUES = [
+    [0.5], [1e5], [-1.5e10], [12, 345, 6789], [0, -0.25, 3E-7, 1e+22],
+    [True, False, None], ["a", "é, ü", "[1, 2]", '"quoted"'],
+    [{"title": "Game", "versions": [{"version": "1.0", "size": 1.5}]}, {}, []],
+    [[1, [2.5, [3e3]]], {"nested": {"number": -7}}],
+    [],
+]
+
+
+@pytest.mark.parametrize("gzip_file", [False, True])
+@pytest.mark.parametrize("values", VALUES, ids=lambda values: json.dumps(values)[:20])
+def test_iter_array_with_any_chunk_size(tmp_path, values, gzip_file):
+    codec = JsonCodec("json")
+    filename = tmp_path / ("items.json.gz" if gzip_file else "items.json")
+    for indent in (None, 2):
+        filename.write_bytes(codec.encode_file(filename, values, indent))
+        for chunk_size in range(1, 12):
+            assert list(codec.iter_array(filename, chunk_size)) == values, (indent, chunk_size)
+
+
+def test_iter_array_reports_bad_separators(tmp_path):
+    filename = tmp_path / "items.json"
+    filename.write_text("[1.5 2]", encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(JsonCodec("json").iter_array(filename, 2))
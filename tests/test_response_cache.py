@@ -0,0 +1,38 @@
+import json
+
+from src.ResponseCache import ResponseCache
+
+
+def make_cache(tmp_path, **options):
+    return ResponseCache(directory=str(tmp_path / "cache"), enabled=True, **options)
+
+
+def test_put_and_get(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("https://example.com/1", "request", b"body", "https://example.com/final", {"ETag": "x", "Other": "y"})
+    assert cache.get("https://example.com/1", "request") == (b"body", "https://example.com/final", {"ETag": "x"})
+    assert cache.get("https://example.com/1", "cloudscraper") is None
+
+
+def test_index_is_written_by_flush_and_every_n_puts(tmp_path):
+    cache = make_cache(tmp_path, flush_every=3)
+    cache.put("https://example.com/1", "request", b"1")
+    cache.put("https://example.com/2", "request", b"2")
+    assert not cache.index_file.exists()
+    cache.put("https://example.com/3", "request", b"3")
+    assert len(json.loads(cache.index_file.read_text())) == 3
+    cache.put("https://example.com/4", "request", b"4")
+    cache.flush()
+    reloaded = make_cache(tmp_path)
+    assert reloaded.get("https://example.com/4", "request")[0] == b"4"
+
+
+def test_eviction_keeps_the_size_under_the_cap(tmp_path):
+    cache = make_cache(tmp_path, max_size_mb=10 / 1024)  # 10 KB
+    for index in range(30):
+        cache.put(f"https://example.com/{index}", "request", bytes(1024))
+    assert cache._size == sum(entry["size"] for entry in cache.entries.values()) <= 10 * 1024
+    assert cache.get("https://example.com/29", "request") is not None
+    assert cache.get("https://example.com/0", "request") is None
+    files = {path.name for path in (tmp_path / "cache").iterdir()}
+    assert files == set(cache.entries)
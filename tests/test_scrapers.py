@@ -0,0 +1,117 @@
+import pytest
+
+from src.Game import Game
+from src.scrapers.F95zoneGameScraper import F95zoneGameScraper
+from src.scrapers.LewdCornerGameScraper import LewdCornerGameScraper
+from src.scrapers.RoriwalrusGameScraper import RoriwalrusGameScraper
+from src.scrapers.AllTheFallenGameScraper import AllTheFallenGameScraper
+from src.scrapers.FapNationGameScraper import FapNationGameScraper
+
+# Markup the scrapers must skip: navigation, scripts, images and replies
+NOISE = "".join(
+    f"<div class='block'><ul class='nav'><li><a href='/forums/{i}/'>Forum {i}</a> <span class='badge'>{i}</span></li></ul>"
+    f"<p>Lorem <b>ipsum</b> &amp; more text {i}.</p><script>var x{i} = '<div>{i}</div>';</script><img src='/i/{i}.png'></div>"
+    for i in range(50)
+)
+REPLIES = "".join(
+    f"<article class='message message--post'><div class='message-inner'><article class='message-body js-selectToQuote'>"
+    f"<div class='bbWrapper'>Reply {i} <b>quote</b> <a href='/posts/{i}'>link</a><br>text<img src='/r/{i}.jpg'></div></article></article>"
+    for i in range(5)
+)
+
+
+def xenforo_page(title, first_post, head_title="Thread", after_title="", fields=""):
+    return f"""<!DOCTYPE html><html><head><title>{head_title}</title>
+<meta property="og:description" content="OG description &amp; more">
+<meta property="twitter:description" content="Twitter description">
+<link rel="canonical" href="https://example.com/threads/game.123/"></head><body>
+<header>{NOISE}</header>
+<div class="p-body"><div class="p-title">{title}</div>{after_title}
+<div class="p-description"><time datetime="2023-05-01">May 1, 2023</time></div>
+{fields}
+<article class="message message--post"><div class="message-inner">
+<article class="message-body js-selectToQuote"><div class="bbWrapper">{first_post}</div></article></div></article>
+{REPLIES}</div><footer>{NOISE}</footer></body></html>"""
+
+
+F95ZONE = xenforo_page(
+    "<h1 class='p-title-value'><a class='labelLink'><span class='label'>RenPy</span></a><span class='label'>Completed</span> Cool Game [v1.2] [Dev]</h1>",
+    """<div aria-label="Zoom" data-src="https://attachments.f95zone.to/cover.jpg"><img src="c.jpg"></div>
+<b>Thread Updated</b>: 2024-02-03<br><b>Release Date</b>: 2023-01-01<br>
+<b>Developer</b>: <a href="https://f95zone.to/members/dev.12/">DevName</a> - <a href="https://patreon.com/dev">Patreon</a><br>
+<b>Version</b>: 1.2<br><b>OS</b>: Windows, Linux, Mac<br><b>Language</b>: English, German<br>
+<div><b>Overview</b>:<br>An overview<br>of the game.</div>
+<b>Genre</b>:<div class="bbCodeBlock bbCodeSpoiler"><button>Spoiler</button><div class="bbCodeBlock-content">3DCG, Male protagonist, Sandbox</div></div>""",
+    after_title="<div class='tagList'><span class='js-tagList'><a class='tagItem' href='/tags/a'>3dcg</a><a class='tagItem' href='/tags/b'> Romance </a></span></div>",
+)
+LEWDCORNER = xenforo_page(
+    "<h1 class='p-title-value'><span class='label'>Complete</span><span>Unity</span>Lewd Game [v0.5]</h1>",
+    """<img src="https://lewdcorner.com/cover.png"><div>Overview:<script class="js-extraPhrases">x</script> The &amp; story</div>
+<div class="bbCodeSpoiler"><button><span class="bbCodeSpoiler-button-title">Genre:</span></button><div class="bbCodeBlock-content">Sandbox, Harem</div></div>""",
+    fields="""<dl class="pairs pairs--customField" data-field="Developer"><dt>Developer</dt><dd> SomeDev </dd></dl>
+<dl data-field="version"><dd>0.5</dd></dl><dl data-field="dateversionrelease"><dd>2024-03-01</dd></dl>
+<dl data-field="dategamerelease"><dd>2022-03-01</dd></dl><dl data-field="Language"><dd>English, French</dd></dl>
+<ol data-field="OS"><li>Windows</li><li> Android</li></ol>
+<dl class="tagList"><dd><a class="tagItem">Harem</a><a class="tagItem">sandbox </a></dd></dl>""",
+)
+RORIWALRUS = xenforo_page(
+    "<h1 class='p-title-value'><span>On hold</span><span>[HTML]</span>RORI GAME TITLE [v3]</h1>",
+    "<img src='https://roriwalrus.com/cover.webp'>Text",
+    fields="""<ul><li data-xf-list-type="ul"><span>Developer Name</span>Rori Dev</li>
+<li data-xf-list-type="ul"><span>Version number</span>3.0</li><li data-xf-list-type="ul"><span>Language </span>English, Spanish</li>
+<li data-xf-list-type="ul"><span>OS </span>Windows, Mac</li></ul>
+<span class="js-tagList"><a class="tagItem">Loli</a><a class="tagItem">rpg</a></span>""",
+)
+ALLTHEFALLEN = xenforo_page(
+    "<h1 class='p-title-value'><span>Tag</span>Fallen Game [v2]</h1>",
+    "<img src='https://allthefallen.moe/cover.jpg'>Body",
+    head_title="Fallen Game - Complete - RPGM - DAZ - AllTheFallen",
+    fields="""<dl data-field="version_number"><dd> 2.0 </dd></dl><dl data-field="last_update"><dd>2024-01-05</dd></dl>
+<dl data-field="developer_name"><dd>Dev A
+Dev B</dd></dl><dl data-field="os_support"><dd><ul><li>Windows</li><li>Linux</li></ul></dd></dl>
+<dl data-field="language"><dd>English, Japanese</dd></dl><dl class="tagList"><a class="tagItem">Incest</a><a class="tagItem">RPG</a></dl>""",
+)
+FAPNATION = f"""<!DOCTYPE html><html><head><title>FN</title>
+<meta property="og:image" content="https://fapnation.com/cover.jpg"><meta property="og:updated_time" content="2024-04-04T10:00:00+00:00">
+<meta property="article:tag" content="Big Tits"><meta property="article:tag" content=" Sandbox"></head><body>{NOISE}
+<h1>Nation Game [v1.0] [Final]<span>[Unity]</span></h1>
+<ul><li><a role="tab" aria-controls="tab-1">Overview</a></li><li><a role="tab" aria-controls="tab-2">Info</a></li><li><a role="tab" aria-controls="tab-3">Changelog</a></li></ul>
+<div id="tab-1"><p>An  overview <b>text</b></p></div>
+<div id="tab-2"><b>OS</b>: Windows, Linux<br><b>Language</b>: English<br><b>Developer</b>: – FapDev<br></div>
+<div id="tab-3"><strong> v1.0 </strong> changes</div>
+<div class="tags"><a>Unity</a></div>{NOISE}</body></html>"""
+
+PAGES = [
+    (F95zoneGameScraper, "https://f95zone.to/threads/game.123/", F95ZONE, "Cool Game"),
+    (LewdCornerGameScraper, "https://lewdcorner.com/threads/game.123/", LEWDCORNER, "Lewd Game"),
+    (RoriwalrusGameScraper, "https://www.roriwalrus.com/index.php?downloads/game.123/", RORIWALRUS, "Rori Game Title"),
+    (AllTheFallenGameScraper, "https://allthefallen.moe/forum/index.php?threads/game.123/", ALLTHEFALLEN, "Fallen Game"),
+    (FapNationGameScraper, "https://fapnation.com/game/", FAPNATION, "Nation Game"),
+]
+OPTIONS = {
+    "html.parser, whole": {"parser": "html.parser", "partial_parse": False},
+    "html.parser, strained": {"parser": "html.parser", "partial_parse": True},
+    "lxml, whole": {"parser": "lxml", "partial_parse": False},
+    "lxml, strained": {"parser": "lxml", "partial_parse": True},
+    "auto": {},
+}
+
+
+def scrape(scraper_class, url, page, **options):
+    scraper = scraper_class(Game(title="x", url=url), **options)
+    # Serve the fixture page, and keep the cover URL instead of downloading it
+    scraper.get_text = lambda url, *args, **kwargs: (page, url)
+    scraper.get_cover = lambda src, *args, **kwargs: src
+    return scraper.get_data(url)
+
+
+@pytest.mark.parametrize("scraper_class, url, page, title", PAGES, ids=[page[0].name for page in PAGES])
+def test_get_data_is_independent_of_the_parse(scraper_class, url, page, title):
+    pytest.importorskip("lxml")
+    results = {name: scrape(scraper_class, url, page, **options) for name, options in OPTIONS.items()}
+    expected = results["html.parser, whole"]
+    assert "error" not in expected
+    assert expected["title"].lower() == title.lower()
+    assert expected["cover_img"].startswith("https://")
+    for name, result in results.items():
+        assert result == expected, name
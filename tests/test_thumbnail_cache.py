@@ -0,0 +1,30 @@
+import os
+
+from PIL import Image
+
+from src.ImageProcessor import image_processor
+from src.ThumbnailCache import ThumbnailCache
+
+
+def test_thumbnails_of_changed_screenshots_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_processor, "workers", 0)
+    screenshots = [tmp_path / f"shot{index}.png" for index in range(3)]
+    for screenshot in screenshots:
+        Image.new("RGB", (640, 360), "red").save(screenshot)
+    cache = ThumbnailCache(str(tmp_path / "thumbnails"), width=64)
+    files = lambda: [(str(path), os.stat(path).st_mtime) for path in screenshots if path.exists()]
+
+    first = cache.get_thumbnails(files(), prune=True)
+    with Image.open(tmp_path / "thumbnails" / first[str(screenshots[0])]) as thumbnail:
+        assert thumbnail.size == (64, 36)
+
+    # Replace one screenshot and delete another
+    os.utime(screenshots[0], (1, 1))
+    screenshots[1].unlink()
+    second = cache.get_thumbnails(files(), prune=True)
+    assert second[str(screenshots[0])] != first[str(screenshots[0])]
+    assert sorted(os.listdir(tmp_path / "thumbnails")) == sorted(second.values())
+
+    # Without prune, thumbnails of other screenshots stay
+    cache.get_thumbnails(files()[:1])
+    assert sorted(os.listdir(tmp_path / "thumbnails")) == sorted(second.values())
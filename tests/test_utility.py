@@ -0,0 +1,28 @@
+import threading
+
+from src.Utility import write_atomic
+
+
+def test_write_atomic_same_file_from_several_threads(tmp_path):
+    path = tmp_path / "cover.png"
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def write(index):
+        barrier.wait()
+        try:
+            for _ in range(50):
+                write_atomic(path, bytes([index]) * 1000)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    content = path.read_bytes()
+    assert len(content) == 1000 and len(set(content)) == 1
+    assert [file.name for file in tmp_path.iterdir()] == ["cover.png"]  # no temporary files left